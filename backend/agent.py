@@ -125,9 +125,7 @@ def create_email_agent(use_mocks: bool = False) -> cf.Agent:
         logger.info("Created Email Agent")
         return agent
     except Exception as e:
-        import traceback
-        error_trace = traceback.format_exc()
-        logger.error(f"Error creating email agent: {str(e)}\nTraceback:\n{error_trace}")
+        logger.exception("Error creating email agent: %s", e)
         raise
 
 def get_default_agent(use_mocks: bool = False) -> cf.Agent:
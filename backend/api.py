@@ -31,6 +31,13 @@ logger = logging.getLogger(__name__)
 # Load environment variables
 load_dotenv()
 
+# Optionally open the Supabase and SERP API connections in the background so the
+# first request doesn't pay for the handshakes (PREWARM=1; off by default for tests)
+if os.environ.get("PREWARM") == "1":
+    from .tools import search as search_tools, supabase as supabase_tools
+    search_tools.prewarm()
+    supabase_tools.prewarm()
+
 # Optional: Set other loggers to DEBUG level
 for module in ["backend", "controlflow"]:
     logging.getLogger(module).setLevel(logging.DEBUG)
@@ -165,6 +172,22 @@ def send_email(request: EmailRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _get_default_template() -> Optional[Dict[str, Any]]:
+    """Fetch the Default Template, creating it first if it doesn't exist yet"""
+    from .tools.supabase import ensure_default_template, get_template_by_name
+
+    template = get_template_by_name("Default Template")
+    if not template:
+        logger.warning("Default Template not found in database, attempting to create it")
+        ensure_default_template()
+        template = get_template_by_name("Default Template")
+
+        if not template:
+            logger.error("Still unable to retrieve Default Template after creation attempt")
+
+    return template
+
+
 @app.post("/create-and-execute-job")
 def create_and_execute_job(request: QueryRequest):
     """Create a job in Supabase, execute the workflow, save leads, and schedule emails"""
@@ -251,6 +274,9 @@ def create_and_execute_job(request: QueryRequest):
         # 7. Schedule emails
         emails_data = []
         if lead_response and lead_response.data:
+            # Look the template up once for the whole batch (served from the template cache)
+            template = _get_default_template()
+
             for lead_record in lead_response.data:
                 lead_id = lead_record["id"]
                 contact_email = lead_record["contact_email"]
@@ -262,33 +288,6 @@ def create_and_execute_job(request: QueryRequest):
                 # Schedule email for 1 day from now
                 scheduled_time = (datetime.now() + timedelta(days=1)).isoformat()
 
-                # Get template
-                try:
-                    logger.info("Attempting to retrieve Default Template from database")
-                    template_response = supabase_client.table("templates").select("*").eq("name", "Default Template").execute()
-                    logger.info(f"Template response data: {template_response.data if hasattr(template_response, 'data') else 'No data'}")
-
-                    template = template_response.data[0] if template_response.data else None
-
-                    if not template:
-                        logger.warning("Default Template not found in database, attempting to create it")
-                        # Try to ensure a default template exists
-                        from .tools.supabase import ensure_default_template
-                        ensure_default_template()
-
-                        # Try to get the template again
-                        template_response = supabase_client.table("templates").select("*").eq("name", "Default Template").execute()
-                        template = template_response.data[0] if template_response.data else None
-
-                        if not template:
-                            logger.error("Still unable to retrieve Default Template after creation attempt")
-
-                except Exception as e:
-                    import traceback
-                    error_trace = traceback.format_exc()
-                    logger.error(f"Error retrieving template: {str(e)}\nTraceback:\n{error_trace}")
-                    template = None
-
                 if template:
                     # Convert dictionary to Lead object
                     from .models import Lead
@@ -361,8 +360,7 @@ def create_and_execute_job(request: QueryRequest):
         }
 
     except Exception as e:
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error executing job: %s", e)
         # If job was created, mark it as failed
         if locals().get("job_id"):
             supabase_client.table("jobs").update({
@@ -44,13 +44,41 @@ CREATE TABLE leads (
 -- Add index for faster lookup by job_id and potentially status
 CREATE INDEX idx_leads_job_id ON leads(job_id);
 CREATE INDEX idx_leads_status ON leads(status);
+CREATE INDEX leads_ready_idx ON leads(job_id) WHERE contact_email IS NOT NULL AND status = 'ReadyToSend'; -- Leads ready to email for a job (leads_ready_to_email)
 CREATE UNIQUE INDEX idx_leads_job_url_job_id ON leads(job_id, job_url); -- Ensure job URLs are unique per job
+CREATE UNIQUE INDEX idx_leads_company_url ON leads(company_url); -- One lead per company; NULLs don't conflict, lets save_lead upsert on company_url
 
 -- Add Row Level Security (Example - adapt based on jobs policy)
 ALTER TABLE leads ENABLE ROW LEVEL SECURITY;
 -- Create a simple policy for single-user systems
 CREATE POLICY "Allow all access to leads" ON leads FOR ALL USING (true);
 
+-- Leads of a job that have an email and are waiting to be sent, as an RPC for get_leads_to_email.
+-- The predicates match leads_ready_idx, so the lookup is a scan of that partial index.
+CREATE OR REPLACE FUNCTION leads_ready_to_email(p_job_id UUID)
+RETURNS TABLE (
+    id UUID,
+    job_id UUID,
+    job_url TEXT,
+    company_url TEXT,
+    role_title TEXT,
+    company_name TEXT,
+    contact_name TEXT,
+    contact_title TEXT,
+    contact_linkedin_url TEXT,
+    contact_email TEXT,
+    status TEXT
+)
+LANGUAGE sql STABLE
+AS $$
+    SELECT l.id, l.job_id, l.job_url, l.company_url, l.role_title, l.company_name,
+           l.contact_name, l.contact_title, l.contact_linkedin_url, l.contact_email, l.status
+    FROM leads l
+    WHERE l.job_id = p_job_id
+      AND l.contact_email IS NOT NULL
+      AND l.status = 'ReadyToSend';
+$$;
+
 -- Table to log individual emails sent (if not just updating lead status)
 CREATE TABLE emails (
     id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
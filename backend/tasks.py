@@ -191,9 +191,7 @@ def send_email_task(lead: Lead, template_name: str = "Default Template", use_moc
         return result
 
     except Exception as e:
-        import traceback
-        error_trace = traceback.format_exc()
-        logger.error(f"Error in send_email_task: {str(e)}\nTraceback:\n{error_trace}")
+        logger.exception("Error in send_email_task: %s", e)
         return {"status": "Failed", "error": str(e)}
 
 def process_job_results_task(job: Job, use_mocks: bool = False) -> Job:
@@ -0,0 +1,53 @@
+"""
+Tests for the HTML extraction helpers in tools/scraping.py
+
+Run from the repository root: python -m pytest backend/tests
+"""
+from selectolax.lexbor import LexborHTMLParser
+from backend.tools.scraping import _find_founder_title, _parse_founders_section
+
+LINKEDIN_URL = "https://www.linkedin.com/in/ann-lee"
+
+
+def test_find_founder_title_skips_the_card_itself():
+    # The card is a <div> holding name, title and link; its own text must not be the title
+    tree = LexborHTMLParser(
+        f'<div class="card"><h3>Ann Lee</h3><div>Founder/CEO</div><a href="{LINKEDIN_URL}">L</a></div>'
+    )
+    assert _find_founder_title(tree.css_first(".card")) == "Founder/CEO"
+
+
+def test_find_founder_title_without_a_title_element():
+    tree = LexborHTMLParser(f'<p class="card"><b>Ann Lee</b> CEO <a href="{LINKEDIN_URL}">L</a></p>')
+    assert _find_founder_title(tree.css_first(".card")) is None
+
+
+def test_founders_section_with_div_cards():
+    tree = LexborHTMLParser(
+        "<h2>Founders</h2>"
+        f'<div><div><b>Ann Lee</b><div>Founder/CEO</div><a href="{LINKEDIN_URL}">L</a></div></div>'
+    )
+    assert _parse_founders_section(tree) == [
+        {"name": "Ann Lee", "title": "Founder/CEO", "linkedin_url": LINKEDIN_URL}
+    ]
+
+
+def test_founders_section_after_a_comment():
+    tree = LexborHTMLParser(
+        "<h2>Founders</h2><!-- founder cards -->"
+        f'<div><div><h3>Ann Lee</h3><p>Co-founder</p><!-- link --><a href="{LINKEDIN_URL}">L</a></div></div>'
+    )
+    assert _parse_founders_section(tree) == [
+        {"name": "Ann Lee", "title": "Co-founder", "linkedin_url": LINKEDIN_URL}
+    ]
+
+
+def test_founders_section_with_inline_cards():
+    # Each card is a <p>; the name is the <b> inside it, not the whole card text
+    tree = LexborHTMLParser(
+        "<h2>Founders</h2><div>"
+        f'<p><b>Ann Lee</b> <span>Founder/CEO</span> <a href="{LINKEDIN_URL}">L</a></p>'
+        '<p><strong>Bo Chen</strong> <span>CTO</span> <a href="https://www.linkedin.com/in/bo-chen">L</a></p>'
+        "</div>"
+    )
+    assert [profile["name"] for profile in _parse_founders_section(tree)] == ["Ann Lee", "Bo Chen"]
@@ -8,6 +8,7 @@ from typing import List
 from .search import generate_google_dorks, execute_google_search
 from .scraping import (
     scrape_job_page, scrape_company_page, find_contact_linkedin,
+    scrape_jobs_bulk, scrape_companies_bulk,
 )
 from .apollo import get_email_from_linkedin, mock_get_email_from_linkedin
 from .email import (
@@ -72,7 +73,5 @@ def get_tools(use_mocks: bool = False) -> List:
     try:
         return ALL_TOOLS
     except Exception as e:
-        import traceback
-        error_trace = traceback.format_exc()
-        logger.error(f"Error loading tools: {str(e)}\nTraceback:\n{error_trace}")
+        logger.exception("Error loading tools: %s", e)
         raise
\ No newline at end of file
@@ -2,6 +2,7 @@
 Apollo.io API integration tools for email lookup
 """
 import requests
+import orjson
 import os
 import logging
 from typing import Optional, Dict, Any
@@ -44,7 +45,7 @@ def get_email_from_linkedin(linkedin_url: str, api_key: Optional[str] = None) ->
         response.raise_for_status()
 
         # Parse the response
-        data = response.json()
+        data = orjson.loads(response.content)
 
         # Check if we got a person record
         if data.get("person"):
@@ -67,15 +68,11 @@ def get_email_from_linkedin(linkedin_url: str, api_key: Optional[str] = None) ->
         return None
 
     except requests.RequestException as e:
-        import traceback
-        tb = traceback.format_exc()
-        logger.error(f"Request error during Apollo API call: {str(e)}\nTraceback:\n{tb}")
+        logger.exception("Request error during Apollo API call: %s", e)
         return None
 
     except Exception as e:
-        import traceback
-        tb = traceback.format_exc()
-        logger.error(f"Error during Apollo API call: {str(e)}\nTraceback:\n{tb}")
+        logger.exception("Error during Apollo API call: %s", e)
         return None
 
 def get_person_details_from_linkedin(linkedin_url: str, api_key: Optional[str] = None) -> Dict[str, Any]:
@@ -111,11 +108,11 @@ def get_person_details_from_linkedin(linkedin_url: str, api_key: Optional[str] =
 
         # Make the request
         response = requests.post(url, json=payload)
-        print("apollo response", response.json())
+        logger.debug("Apollo response: %s", response.text)
         response.raise_for_status()
 
         # Parse the response
-        data = response.json()
+        data = orjson.loads(response.content)
 
         # Check if we got a person record
         if data.get("person"):
@@ -125,15 +122,11 @@ def get_person_details_from_linkedin(linkedin_url: str, api_key: Optional[str] =
         return {}
 
     except requests.RequestException as e:
-        import traceback
-        tb = traceback.format_exc()
-        logger.error(f"Request error during Apollo API call: {str(e)}\nTraceback:\n{tb}")
+        logger.exception("Request error during Apollo API call: %s", e)
         return {}
 
     except Exception as e:
-        import traceback
-        tb = traceback.format_exc()
-        logger.error(f"Error during Apollo API call: {str(e)}\nTraceback:\n{tb}")
+        logger.exception("Error during Apollo API call: %s", e)
         return {}
 
 # Mock implementation for testing without making actual API calls
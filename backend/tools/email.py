@@ -11,7 +11,6 @@ from typing import Optional, Dict, Any, List
 from datetime import datetime, timedelta, time
 import pytz
 from ..models import Lead, EmailTemplate
-import traceback
 
 logger = logging.getLogger(__name__)
 
@@ -2,421 +2,1091 @@
 Web scraping tools for extracting data from WorkAtAStartup.com using Playwright
 """
 import logging
-from typing import Dict, List, Optional
-from urllib.parse import urljoin
+import os
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+from urllib.parse import urljoin, urlparse
 import asyncio
-from playwright.async_api import async_playwright, Page, Error as PlaywrightError
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+import atexit
+import random
+import re
+import tempfile
+import threading
+import time
+from collections import defaultdict
+import diskcache
+import httpx
+from selectolax.lexbor import LexborHTMLParser, LexborNode
+from playwright.async_api import async_playwright, Browser, BrowserContext, Page, Response, Error as PlaywrightError, TimeoutError as PlaywrightTimeoutError
 from ..models import JobPageDetails, CompanyPageDetails
 
 logger = logging.getLogger(__name__)
 
-async def scrape_job_page(url: str) -> JobPageDetails:
+_BASE_URL = "https://www.workatastartup.com"
+
+_USER_AGENT = (
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36"
+)
+
+# Description sections collected from job pages, in output order
+_JOB_SECTION_TITLES = ("About the role", "Responsibilities", "Requirements")
+_JOB_SECTION_RE = re.compile("|".join(re.escape(title) for title in _JOB_SECTION_TITLES), re.IGNORECASE)
+
+# Keyword detectors for founder headings and titles
+_FOUNDERS_HEADING_RE = re.compile(r"founders", re.IGNORECASE)
+_FOUNDER_RE = re.compile(r"founder", re.IGNORECASE)
+_FOUNDER_TITLE_RE = re.compile(r"founder|ceo|chief", re.IGNORECASE)
+
+# Status codes that mean a page is gone for good
+_DEAD_STATUSES = (404, 410)
+
+# Default number of pages scraped at once by the bulk helpers
+_DEFAULT_SCRAPE_CONCURRENCY = 5
+
+# Default cap on requests per second to a single host (SCRAPE_RATE_LIMIT); 0 leaves
+# requests unthrottled unless a limit is configured
+_DEFAULT_SCRAPE_RATE_LIMIT = 0.0
+
+# How long scraped pages stay in the on-disk cache (SCRAPE_CACHE_DIR). Company pages
+# rarely change; job pages are kept for less time since listings get closed or edited
+_COMPANY_CACHE_TTL = 7 * 24 * 3600
+_JOB_CACHE_TTL = 24 * 3600
+
+# Nodes each extractor reads; navigation waits for these instead of network idle
+_JOB_READY_SELECTOR = 'h1, a[href*="/companies/"]'
+_COMPANY_READY_SELECTOR = 'h1, img, a[href*="linkedin.com"]'
+_READY_TIMEOUT_MS = 10_000
+
+# Navigation retry policy: retries after the first attempt, exponential base delay,
+# max jitter and delay cap (seconds), and the statuses worth retrying
+_MAX_RETRIES = 3
+_BACKOFF_BASE = 1.0
+_BACKOFF_JITTER = 0.5
+_BACKOFF_CAP = 30.0
+_RETRY_STATUSES = (429, 503)
+
+# Chromium flags that skip subsystems a headless scraper never uses (GPU, sandbox,
+# extensions, background services) to cut cold-start time and memory per instance
+_CHROMIUM_ARGS = [
+    "--no-sandbox",
+    "--disable-dev-shm-usage",
+    "--disable-gpu",
+    "--disable-extensions",
+    "--disable-background-networking",
+    "--disable-sync",
+    "--disable-default-apps",
+    "--disable-translate",
+    "--mute-audio",
+    "--no-first-run",
+    "--disable-features=IsolateOrigins,site-per-process,TranslateUI",
+]
+
+# Options applied to every browser context created for scraping
+_CONTEXT_OPTIONS = {
+    "viewport": {"width": 1280, "height": 800},
+    "ignore_https_errors": True,
+}
+
+# Analytics/tracking domains loaded by workatastartup.com that the scrapers never read;
+# a request is blocked when its host is one of these or a subdomain of one
+_BLOCKED_DOMAINS = (
+    "googletagmanager.com",
+    "google-analytics.com",
+    "segment.io",
+    "segment.com",
+    "intercom.io",
+    "intercomcdn.com",
+    "doubleclick.net",
+    "facebook.net",
+    "hotjar.com",
+    "mixpanel.com",
+    "sentry.io",
+    "clarity.ms",
+)
+
+# Resource types never rendered by the scrapers. Aborting the fetch still leaves the
+# <img> and <link> nodes in the DOM, so selectors over them keep working.
+_BLOCKED_RESOURCE_TYPES = frozenset({"image", "media", "font", "stylesheet"})
+
+
+def _is_blocked_host(url: str) -> bool:
+    """Whether url's host is one of _BLOCKED_DOMAINS or a subdomain of one"""
+    host = (urlparse(url).hostname or "").lower()
+    return any(host == domain or host.endswith("." + domain) for domain in _BLOCKED_DOMAINS)
+
+
+async def _route_request(route) -> None:
+    """Abort heavy asset and third-party tracking requests and let everything else through"""
+    request = route.request
+    # Never abort a navigation, whatever its URL
+    if request.resource_type != "document" and (
+        request.resource_type in _BLOCKED_RESOURCE_TYPES or _is_blocked_host(request.url)
+    ):
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+class BrowserPool:
+    """
+    Keeps one Playwright driver and Chromium instance alive across scrapes
+
+    Launching Chromium costs seconds, so it happens once; every scrape then gets
+    its own cheap, isolated BrowserContext which is closed on release.
+    Playwright objects are bound to the loop that created them, so the pool is
+    only used from the shared background loop (see _on_background_loop).
+    """
+
+    def __init__(self):
+        self._playwright = None
+        self._browser: Optional[Browser] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock: Optional[asyncio.Lock] = None
+
+    async def _ensure_browser(self) -> Browser:
+        """Start Playwright and launch Chromium on first use (or after a disconnect)"""
+        loop = asyncio.get_running_loop()
+        if self._loop is None:
+            self._lock = asyncio.Lock()
+            self._loop = loop
+        elif self._loop is not loop:
+            raise RuntimeError("BrowserPool used outside the event loop it was started on")
+
+        async with self._lock:
+            if self._browser is None or not self._browser.is_connected():
+                if self._playwright is None:
+                    self._playwright = await async_playwright().start()
+                logger.info("Launching shared Chromium instance for scraping")
+                self._browser = await self._playwright.chromium.launch(
+                    headless=True, args=_CHROMIUM_ARGS, chromium_sandbox=False
+                )
+        return self._browser
+
+    async def get_context(self) -> BrowserContext:
+        """
+        Get a fresh browser context from the shared browser
+
+        Returns:
+            BrowserContext with the scraping options and request router installed
+        """
+        browser = await self._ensure_browser()
+        context = await browser.new_context(**_CONTEXT_OPTIONS)
+        await context.route("**/*", _route_request)
+        return context
+
+    async def release(self, context: BrowserContext) -> None:
+        """Close a context obtained from get_context"""
+        try:
+            await context.close()
+        except PlaywrightError as e:
+            logger.debug("Error closing browser context: %s", e)
+
+    async def close(self) -> None:
+        """Close the shared browser and stop Playwright"""
+        if self._browser is not None:
+            await self._browser.close()
+        if self._playwright is not None:
+            await self._playwright.stop()
+        self._browser = None
+        self._playwright = None
+
+    def shutdown(self) -> None:
+        """Synchronously close the browser if its event loop is still usable"""
+        loop = self._loop
+        if self._browser is None or loop is None or loop.is_closed():
+            return
+        try:
+            if loop.is_running():
+                # Loop lives in another thread (see run_async); hand the close over to it
+                asyncio.run_coroutine_threadsafe(self.close(), loop).result(timeout=10)
+            else:
+                loop.run_until_complete(self.close())
+        except Exception as e:
+            logger.debug("Error shutting down browser pool: %s", e)
+
+
+_browser_pool = BrowserPool()
+atexit.register(_browser_pool.shutdown)
+
+
+class DomainLimiter:
+    """
+    Spaces out requests to each host so no host sees more than `rate` per second
+
+    Requests to the same host wait on a per-host lock and sleep until the minimum
+    interval since the previous request has passed; different hosts don't block
+    each other. A rate of 0 or less disables limiting.
+    """
+
+    def __init__(self, rate: float):
+        self.min_interval = 1 / rate if rate > 0 else 0.0
+        self._last: Dict[str, float] = {}
+        self._locks: Dict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def acquire(self, host: str) -> None:
+        """Wait until a request to host is allowed"""
+        if not self.min_interval:
+            return
+
+        # asyncio locks are bound to the loop they are first used on
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._locks.clear()
+            self._loop = loop
+
+        async with self._locks[host]:
+            delay = self._last.get(host, float("-inf")) + self.min_interval - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self._last[host] = time.monotonic()
+
+
+_domain_limiter: Optional[DomainLimiter] = None
+
+
+async def _throttle(url: str) -> None:
+    """Wait for the per-host rate limit before requesting url"""
+    global _domain_limiter
+    if _domain_limiter is None:
+        _domain_limiter = DomainLimiter(float(os.environ.get("SCRAPE_RATE_LIMIT", _DEFAULT_SCRAPE_RATE_LIMIT)))
+    await _domain_limiter.acquire(urlparse(url).netloc)
+
+
+_scrape_cache: Optional[diskcache.Cache] = None
+
+
+def _get_scrape_cache() -> diskcache.Cache:
+    """Return the on-disk scrape cache, opening it under SCRAPE_CACHE_DIR on first use"""
+    global _scrape_cache
+    if _scrape_cache is None:
+        directory = os.environ.get("SCRAPE_CACHE_DIR") or os.path.join(tempfile.gettempdir(), "wscache")
+        _scrape_cache = diskcache.Cache(directory)
+    return _scrape_cache
+
+
+# Shared httpx client; like the browser pool it lives on the background loop
+_http_client: Optional[httpx.AsyncClient] = None
+_http_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _get_http_client() -> httpx.AsyncClient:
+    """Return the shared httpx client, creating it on first use"""
+    global _http_client, _http_client_loop
+    loop = asyncio.get_running_loop()
+    if _http_client is None:
+        _http_client = httpx.AsyncClient(
+            http2=True, timeout=15, follow_redirects=True, headers={"user-agent": _USER_AGENT}
+        )
+        _http_client_loop = loop
+    elif _http_client_loop is not loop:
+        raise RuntimeError("Shared HTTP client used outside the event loop it was created on")
+    return _http_client
+
+
+def _close_http_client() -> None:
+    """Close the shared httpx client's connections on its own loop, if it is still running"""
+    global _http_client
+    client, loop = _http_client, _http_client_loop
+    if client is None or loop is None or not loop.is_running():
+        return
+    try:
+        asyncio.run_coroutine_threadsafe(client.aclose(), loop).result(timeout=10)
+    except Exception as e:
+        logger.debug("Error closing HTTP client: %s", e)
+    _http_client = None
+
+
+atexit.register(_close_http_client)
+
+
+async def _fast_fetch(url: str) -> Tuple[Optional[int], Optional[LexborHTMLParser]]:
+    """
+    Fetch a page over plain HTTP and parse it, without a browser
+
+    Many workatastartup.com pages are server-rendered, so this is often all a scrape
+    needs. Callers escalate to Playwright when the parsed tree lacks what they extract.
+
+    Args:
+        url: URL of the page
+
+    Returns:
+        Tuple of (HTTP status or None on network error, parsed tree or None unless 200)
+    """
+    await _throttle(url)
+    try:
+        response = await _get_http_client().get(url)
+    except httpx.HTTPError as e:
+        logger.debug("Fast fetch failed for %s: %s", url, e)
+        return None, None
+    if response.status_code != 200:
+        return response.status_code, None
+    return response.status_code, LexborHTMLParser(response.text)
+
+
+async def _wait_for_content(page: Page, selector: str, url: str) -> None:
+    """Wait for the nodes an extractor needs, carrying on with the current DOM on timeout"""
+    try:
+        await page.wait_for_selector(selector, timeout=_READY_TIMEOUT_MS)
+    except PlaywrightTimeoutError:
+        logger.warning("Timed out waiting for %r on %s, extracting from current DOM", selector, url)
+
+
+def _backoff_delay(attempt: int, base: float = _BACKOFF_BASE) -> float:
+    """Exponential backoff with jitter for the given zero-based retry attempt, capped"""
+    return min(_BACKOFF_CAP, base * 2 ** attempt + random.random() * _BACKOFF_JITTER)
+
+
+def _retry_after(response: Response) -> Optional[float]:
+    """Seconds to wait according to a response's Retry-After header, if it has a usable one"""
+    value = response.headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            seconds = (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds()
+        except (TypeError, ValueError):
+            return None
+    return min(_BACKOFF_CAP, max(0.0, seconds))
+
+
+async def _goto_with_retry(page: Page, url: str, max_retries: int = _MAX_RETRIES,
+                           base: float = _BACKOFF_BASE) -> Optional[Response]:
+    """
+    Navigate page to url, retrying transient failures with exponential backoff
+
+    Navigation errors (timeouts, resets) and 429/503 responses are retried up to
+    max_retries times, waiting base * 2**attempt seconds plus jitter, capped at 30s.
+    A Retry-After header on a 429/503 response takes precedence over the backoff.
+
+    Args:
+        page: Page to navigate
+        url: URL to load
+        max_retries: Retries after the first attempt
+        base: Base delay in seconds
+
+    Returns:
+        The last navigation response, which may still carry an error status
+
+    Raises:
+        PlaywrightError: If navigation still fails after the last retry, or the page is missing
+    """
+    for attempt in range(max_retries + 1):
+        await _throttle(url)
+        try:
+            response = await page.goto(url, wait_until="domcontentloaded")
+        except PlaywrightError as e:
+            if "404" in str(e) or "Page not found" in str(e) or attempt == max_retries:
+                raise
+            delay = _backoff_delay(attempt, base)
+            logger.warning("Navigation to %s failed (attempt %s), retrying in %.1fs: %s", url, attempt + 1, delay, e)
+        else:
+            if response is None or response.status not in _RETRY_STATUSES or attempt == max_retries:
+                return response
+            delay = _retry_after(response)
+            if delay is None:
+                delay = _backoff_delay(attempt, base)
+            logger.warning("%s returned status %s (attempt %s), retrying in %.1fs", url, response.status, attempt + 1, delay)
+        await asyncio.sleep(delay)
+
+
+def _absolute_url(href: str) -> str:
+    """
+    Resolve an href from workatastartup.com against the site root
+
+    Absolute and root-relative hrefs, which cover almost every link on the site,
+    are handled with plain string checks; anything else goes through urljoin.
+    """
+    if href.startswith("http"):
+        return href
+    if href.startswith("/"):
+        return _BASE_URL + href
+    return urljoin(_BASE_URL, href)
+
+
+# Reads everything the job extractor needs in one round trip: the ".company-name"
+# text, the h1, the company link and the known description sections
+_JOB_PAGE_JS = """
+() => {
+    const companyName = document.querySelector('.company-name');
+    const h1 = document.querySelector('h1');
+    const companyLink = document.querySelector('a[href*="/companies/"]');
+
+    // First heading for each known description section, in a single pass over headings
+    const sectionHeadings = {};
+    for (const node of document.querySelectorAll('h2, h3')) {
+        for (const match of node.innerText.matchAll(/about the role|responsibilities|requirements/gi)) {
+            const key = match[0].toLowerCase();
+            if (!(key in sectionHeadings)) sectionHeadings[key] = node;
+        }
+    }
+
+    // Content of the element right after each section heading
+    const sections = [];
+    for (const title of ['About the role', 'Responsibilities', 'Requirements']) {
+        const heading = sectionHeadings[title.toLowerCase()];
+        const next = heading ? heading.nextElementSibling : null;
+        const content = next ? next.innerText : '';
+        if (content) sections.push({ title, content });
+    }
+
+    // Fallback to main content if no specific sections found
+    const main = sections.length ? null : document.querySelector('main');
+
+    return {
+        company_name_text: companyName ? companyName.innerText : null,
+        role_text: h1 ? h1.innerText : null,
+        company_href: companyLink ? companyLink.getAttribute('href') : null,
+        sections,
+        main_text: main ? main.innerText : null
+    };
+}
+"""
+
+
+def _node_text(node: LexborNode) -> str:
+    """Text of a parsed node with its text nodes joined by newlines, roughly matching innerText"""
+    return node.text(deep=True, separator="\n", strip=True)
+
+
+def _is_element(node: LexborNode) -> bool:
+    """Whether node is an element rather than a text or comment node"""
+    return node.tag not in ("-text", "-comment")
+
+
+def _next_element(node: LexborNode) -> Optional[LexborNode]:
+    """Next sibling of node that is an element, skipping text and comment nodes"""
+    sibling = node.next
+    while sibling is not None and not _is_element(sibling):
+        sibling = sibling.next
+    return sibling
+
+
+def _descendants(root: LexborNode, tags: Tuple[str, ...]) -> Iterator[LexborNode]:
+    """
+    Elements under root with one of the given tags, in document order
+
+    Stands in for querySelectorAll: selectolax's css() also matches root itself,
+    and some versions return comma-separated selector matches grouped by selector.
+    """
+    for node in root.traverse():
+        if node.tag in tags and node.mem_id != root.mem_id:
+            yield node
+
+
+def _climb(node: LexborNode, stop=None) -> LexborNode:
+    """Walk up at most three levels from node, stopping early once stop(element) is true"""
+    element = node
+    for _ in range(3):
+        if element.parent is None:
+            break
+        element = element.parent
+        if stop is not None and stop(element):
+            break
+    return element
+
+
+def _find_founder_title(root: LexborNode) -> Optional[str]:
+    """Text of the first p/div under root that looks like a founder title"""
+    for element in _descendants(root, ("p", "div")):
+        text = _node_text(element)
+        if text and _FOUNDER_TITLE_RE.search(text):
+            return text
+    return None
+
+
+def _parse_founders_section(tree: LexborHTMLParser) -> List[dict]:
+    """
+    Extract founder profiles from the container after the "Founders" heading
+
+    Runs over HTML that has already been fetched, so no browser round trips are needed.
+
+    Args:
+        tree: Parsed company page HTML
+
+    Returns:
+        List of {name, title, linkedin_url} dicts, empty if the section isn't found
+    """
+    heading = next(
+        (node for node in _descendants(tree.root, ("h2", "h3", "h4")) if _FOUNDERS_HEADING_RE.search(_node_text(node))),
+        None,
+    )
+    if heading is None:
+        return []
+
+    # The container right after the heading holds all founder profiles
+    container = _next_element(heading)
+    if container is None:
+        return []
+
+    profiles = []
+
+    for link in container.css('a[href*="linkedin.com"]'):
+        linkedin_url = link.attributes.get('href')
+        # Only add if we have a LinkedIn URL
+        if not linkedin_url:
+            continue
+
+        # Go up to likely profile container, without leaving the founders container
+        profile_element = _climb(
+            link, lambda element: element.mem_id == container.mem_id or sum(1 for child in element.iter() if _is_element(child)) >= 3
+        )
+
+        profile = {'name': None, 'title': _find_founder_title(profile_element), 'linkedin_url': linkedin_url}
+
+        # Find name, skipping elements with "founder" which is likely a title
+        for element in _descendants(profile_element, ("h3", "h4", "strong", "b", "p")):
+            text = _node_text(element)
+            if text and len(text) < 50 and not _FOUNDER_RE.search(text):
+                profile['name'] = text
+                break
+
+        profiles.append(profile)
+
+    return profiles
+
+
+def _parse_linked_founders(tree: LexborHTMLParser) -> List[dict]:
+    """
+    Find founder profiles from LinkedIn links anywhere on the page
+
+    Fallback for pages without a usable "Founders" section: a link counts when one
+    of its three nearest ancestors reads like a founder title.
+
+    Args:
+        tree: Parsed company page HTML
+
+    Returns:
+        List of {name, title, linkedin_url} dicts
+    """
+    profiles = []
+
+    for link in tree.css('a[href*="linkedin.com"]'):
+        # Check surrounding text for founder-related terms
+        near = _climb(link, lambda element: bool(_FOUNDER_TITLE_RE.search(element.text(deep=True))))
+        if near is link or not _FOUNDER_TITLE_RE.search(near.text(deep=True)):
+            continue
+
+        # Extract name and title from three levels above the link
+        element = _climb(link)
+        name_node = next(_descendants(element, ("h3", "h4", "strong", "b")), None)
+        name = _node_text(name_node) if name_node is not None else None
+
+        profiles.append({
+            'linkedin_url': link.attributes.get('href'),
+            'name': name or None,
+            'title': _find_founder_title(element),
+        })
+
+    return profiles
+
+
+def _parse_job_html(tree: LexborHTMLParser) -> Dict[str, Any]:
+    """
+    Read the job extractor's inputs from parsed HTML
+
+    Python counterpart of _JOB_PAGE_JS for pages fetched without a browser.
+
+    Args:
+        tree: Parsed job listing HTML
+
+    Returns:
+        Dict shaped like the _JOB_PAGE_JS result
+    """
+    company_name = tree.css_first('.company-name')
+    role = tree.css_first('h1')
+    company_link = tree.css_first('a[href*="/companies/"]')
+
+    # First heading for each known description section, in a single pass over headings
+    section_headings = {}
+    for node in _descendants(tree.root, ("h2", "h3")):
+        for match in _JOB_SECTION_RE.finditer(_node_text(node)):
+            section_headings.setdefault(match.group(0).lower(), node)
+
+    # Content of the element right after each section heading
+    sections = []
+    for title in _JOB_SECTION_TITLES:
+        heading = section_headings.get(title.lower())
+        content_node = _next_element(heading) if heading is not None else None
+        content = _node_text(content_node) if content_node is not None else ''
+        if content:
+            sections.append({'title': title, 'content': content})
+
+    # Fallback to main content if no specific sections found
+    main = None if sections else tree.css_first('main')
+
+    return {
+        'company_name_text': _node_text(company_name) if company_name is not None else None,
+        'role_text': _node_text(role) if role is not None else None,
+        'company_href': company_link.attributes.get('href') if company_link is not None else None,
+        'sections': sections,
+        'main_text': _node_text(main) if main is not None else None,
+    }
+
+
+def _apply_job_data(data: Dict[str, Any], job_details: JobPageDetails) -> None:
+    """
+    Populate job_details from extracted job page data
+
+    Args:
+        data: Result of _JOB_PAGE_JS or _parse_job_html
+        job_details: JobPageDetails object to fill in
+    """
+    # Get role and company from the specific span element
+    full_text = data.get('company_name_text')
+    if full_text:
+        logger.info("Found company-name element: %s", full_text)
+
+        # Parse text like "Ex-Founder at SimCare AI (S24)"
+        if " at " in full_text:
+            parts = full_text.split(" at ", 1)
+            job_details.role_title = parts[0].strip()
+
+            # Handle company name with batch annotation like "(S24)"
+            company_part = parts[1].strip()
+            if " (" in company_part:
+                company_part = company_part.split(" (", 1)[0].strip()
+            job_details.company_name = company_part
+
+    # If we didn't get the role title from the company name element, use the h1
+    if not job_details.role_title and data.get('role_text'):
+        job_details.role_title = data['role_text']
+
+    # Get company URL - direct link to company page
+    if data.get('company_href'):
+        job_details.company_url = _absolute_url(data['company_href'])
+
+    # Combine the description sections
+    description_sections = [f"{section['title']}\n\n{section['content']}" for section in data.get('sections') or []]
+    if description_sections:
+        job_details.job_description = "\n\n".join(description_sections)
+    elif data.get('main_text'):
+        job_details.job_description = data['main_text']
+
+
+async def _extract_job_details(page: Page, job_details: JobPageDetails) -> None:
+    """
+    Populate job_details from an already loaded job listing page
+
+    Args:
+        page: Playwright page showing the job listing
+        job_details: JobPageDetails object to fill in
+    """
+    _apply_job_data(await page.evaluate(_JOB_PAGE_JS), job_details)
+
+
+def _parse_company_html(tree: LexborHTMLParser) -> Dict[str, Any]:
+    """
+    Read the company name and founders-section profiles from parsed HTML
+
+    Args:
+        tree: Parsed company page HTML
+
+    Returns:
+        Dict with company_name and founders (the page-wide fallback is left to the caller)
+    """
+    company_name = tree.css_first('h1')
+    return {
+        'company_name': _node_text(company_name) if company_name is not None else None,
+        'founders': _parse_founders_section(tree),
+    }
+
+
+def _collect_founders(profiles: List[dict], seen_names: set, seen_urls: set) -> List[dict]:
+    """
+    Normalise founder profiles from either extraction branch, dropping duplicates
+
+    Args:
+        profiles: Profiles with optional name, title and linkedin_url keys
+        seen_names: Names already collected, updated in place
+        seen_urls: LinkedIn URLs already collected, updated in place
+
+    Returns:
+        List of founder dicts with a LinkedIn URL and a title
+    """
+    founders = []
+    for profile in profiles:
+        name = profile.get('name')
+        linkedin_url = profile.get('linkedin_url')
+        if not linkedin_url or linkedin_url in seen_urls or (name and name in seen_names):
+            continue
+        seen_urls.add(linkedin_url)
+
+        founder = {'linkedin_url': linkedin_url}
+        if name:
+            seen_names.add(name)
+            founder['name'] = name
+        # If no title was found but we have LinkedIn, set a default title
+        founder['title'] = profile.get('title') or "Co-founder"
+
+        founders.append(founder)
+    return founders
+
+
+def _apply_company_data(data: Dict[str, Any], company_details: CompanyPageDetails) -> None:
+    """
+    Populate company_details (name and founders) from extracted company page data
+
+    Args:
+        data: Result of _parse_company_html, optionally with linked_founders
+        company_details: CompanyPageDetails object to fill in
+    """
+    # Extract company name only if not already set (normally it should be set from job page)
+    if not company_details.company_name and data.get('company_name'):
+        company_details.company_name = data['company_name']
+
+    # Names and LinkedIn URLs already taken, shared by both branches
+    seen_names, seen_urls = set(), set()
+
+    # FOCUS ONLY ON FOUNDERS SECTION
+    founders = _collect_founders(data.get('founders') or [], seen_names, seen_urls)
+
+    # If we couldn't find founders through the section heading, fall back to LinkedIn
+    # links elsewhere on the page, already filtered to founder profiles in the page
+    if not founders:
+        founders = _collect_founders(data.get('linked_founders') or [], seen_names, seen_urls)
+
+    company_details.founders = founders
+
+
+async def _extract_company_details(page: Page, company_details: CompanyPageDetails) -> None:
+    """
+    Populate company_details (name and founders) from an already loaded company page
+
+    Args:
+        page: Playwright page showing the company profile
+        company_details: CompanyPageDetails object to fill in
+    """
+    # Parse the rendered HTML in-process: one page.content() call and no DOM walking
+    tree = LexborHTMLParser(await page.content())
+    data = _parse_company_html(tree)
+
+    # Only look at LinkedIn links elsewhere on the page when the section yields nothing
+    if not data['founders']:
+        data['linked_founders'] = _parse_linked_founders(tree)
+
+    _apply_company_data(data, company_details)
+
+
+async def scrape_job_page(url: str, ignore_cache: bool = False) -> JobPageDetails:
+    """
+    Scrape a job listing page on workatastartup.com, reusing a cached result when fresh
+
+    Pages that yielded a role title are kept on disk for a day, keyed by URL.
+
+    Args:
+        url: URL of the job listing page
+        ignore_cache: Scrape the page even if a cached result exists
+
+    Returns:
+        JobPageDetails object with extracted information
+    """
+    cache = _get_scrape_cache()
+    key = f"job:{url}"
+    if not ignore_cache:
+        cached = cache.get(key)
+        if cached:
+            logger.info("Using cached job page: %s", url)
+            return JobPageDetails.model_validate(cached)
+
+    job_details = await _on_background_loop(_scrape_job_page(url))
+    if job_details.role_title:
+        cache.set(key, job_details.model_dump(mode="json"), expire=_JOB_CACHE_TTL)
+    return job_details
+
+
+async def _scrape_job_page(url: str) -> JobPageDetails:
     """
     Scrape a job listing page on workatastartup.com using Playwright
 
+    The page is first fetched over plain HTTP; Playwright is only used when the
+    server-rendered HTML doesn't yield a role title. Transient Playwright errors
+    are retried with exponential backoff and jitter on the same page, so a flaky
+    navigation doesn't cost a browser relaunch.
+
     Args:
         url: URL of the job listing page
 
     Returns:
         JobPageDetails object with extracted information
     """
-    logger.info(f"Scraping job page: {url}")
+    logger.info("Scraping job page: %s", url)
 
     # Initialize the return object with the URL
     job_details = JobPageDetails(job_url=url)
 
     try:
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=True)
-            context = await browser.new_context()
+        # Try plain HTTP first; the browser is only needed when the HTML lacks the role
+        status, tree = await _fast_fetch(url)
+        if status in _DEAD_STATUSES:
+            logger.warning("Page not found (%s): %s", status, url)
+            return job_details
+        if tree is not None:
+            _apply_job_data(_parse_job_html(tree), job_details)
+            if job_details.role_title:
+                logger.info("Successfully scraped job page without a browser: %s", url)
+                return job_details
+
+        context = await _browser_pool.get_context()
+        try:
             page = await context.new_page()
 
-            try:
-                # Navigate to the job page
-                response = await page.goto(url, wait_until="networkidle")
-
-                # Check if page returned 404 Not Found or other error status
-                if response and (response.status >= 400 or not response.ok):
-                    logger.warning(f"Page returned status {response.status}: {url}")
-                    return job_details
-
-                # Direct targeting of elements with specific classes
-
-                # Get role and company from the specific span element
-                company_name_element = await page.query_selector('.company-name')
-                if company_name_element:
-                    full_text = await company_name_element.inner_text()
-                    logger.info(f"Found company-name element: {full_text}")
-
-                    # Parse text like "Ex-Founder at SimCare AI (S24)"
-                    if " at " in full_text:
-                        parts = full_text.split(" at ", 1)
-                        job_details.role_title = parts[0].strip()
-
-                        # Handle company name with batch annotation like "(S24)"
-                        company_part = parts[1].strip()
-                        if " (" in company_part:
-                            company_part = company_part.split(" (", 1)[0].strip()
-                        job_details.company_name = company_part
-
-                # If we didn't get the role title from the company name element, look for it directly
-                if not job_details.role_title:
-                    role_element = await page.query_selector('h1')
-                    if role_element:
-                        job_details.role_title = await role_element.inner_text()
-
-                # Get company URL - direct link to company page
-                company_link = await page.query_selector('a[href*="/companies/"]')
-                if company_link:
-                    company_url = await company_link.get_attribute('href')
-                    if company_url:
-                        job_details.company_url = urljoin('https://www.workatastartup.com', company_url)
-
-                # Extract job description - look for specific content sections
-                description_sections = []
-
-                # Look for "About the role" section directly
-                about_role = await page.query_selector('h2:has-text("About the role"), h3:has-text("About the role")')
-                if about_role:
-                    # Get the next element which contains the content
-                    content = await about_role.evaluate('el => { let next = el.nextElementSibling; return next ? next.innerText : ""; }')
-                    if content:
-                        description_sections.append(f"About the role\n\n{content}")
-
-                # Look for "Responsibilities" section
-                responsibilities = await page.query_selector('h2:has-text("Responsibilities"), h3:has-text("Responsibilities")')
-                if responsibilities:
-                    content = await responsibilities.evaluate('el => { let next = el.nextElementSibling; return next ? next.innerText : ""; }')
-                    if content:
-                        description_sections.append(f"Responsibilities\n\n{content}")
-
-                # Look for "Requirements" section
-                requirements = await page.query_selector('h2:has-text("Requirements"), h3:has-text("Requirements")')
-                if requirements:
-                    content = await requirements.evaluate('el => { let next = el.nextElementSibling; return next ? next.innerText : ""; }')
-                    if content:
-                        description_sections.append(f"Requirements\n\n{content}")
-
-                # Combine all sections
-                if description_sections:
-                    job_details.job_description = "\n\n".join(description_sections)
-                else:
-                    # Fallback to main content if no specific sections found
-                    main_content = await page.query_selector('main')
-                    if main_content:
-                        job_details.job_description = await main_content.inner_text()
-
-            except PlaywrightError as e:
-                # Handle Playwright-specific errors like navigation failures
-                if "404" in str(e) or "Page not found" in str(e):
-                    logger.warning(f"Page not found (404): {url}")
-                else:
-                    logger.error(f"Playwright error scraping job page {url}: {str(e)}")
-
-            await browser.close()
-
-        logger.info(f"Successfully scraped job page: {url}")
+            # Navigate to the job page
+            response = await _goto_with_retry(page, url)
+
+            # Check if page returned 404 Not Found or other error status
+            if response and (response.status >= 400 or not response.ok):
+                logger.warning("Page returned status %s: %s", response.status, url)
+            else:
+                await _wait_for_content(page, _JOB_READY_SELECTOR, url)
+                await _extract_job_details(page, job_details)
+
+        except PlaywrightError as e:
+            # Handle Playwright-specific errors like navigation failures
+            if "404" in str(e) or "Page not found" in str(e):
+                logger.warning("Page not found (404): %s", url)
+            else:
+                logger.error("Playwright error scraping job page %s: %s", url, e)
+
+        finally:
+            await _browser_pool.release(context)
+
+        logger.info("Successfully scraped job page: %s", url)
         return job_details
 
-    except Exception as e:
-        import traceback
-        tb = traceback.format_exc()
-        logger.error(f"Error scraping job page {url}: {str(e)}\nTraceback:\n{tb}")
+    except Exception:
+        logger.exception("Error scraping job page %s", url)
         return job_details
 
 
-async def scrape_company_page(url: str) -> CompanyPageDetails:
+async def scrape_company_page(url: str, ignore_cache: bool = False) -> CompanyPageDetails:
+    """
+    Scrape a company page on workatastartup.com, reusing a cached result when fresh
+
+    Pages that yielded founders are kept on disk for a week, keyed by URL, so jobs
+    at the same company only scrape it once.
+
+    Args:
+        url: URL of the company page
+        ignore_cache: Scrape the page even if a cached result exists
+
+    Returns:
+        CompanyPageDetails object with extracted information
+    """
+    cache = _get_scrape_cache()
+    key = f"company:{url}"
+    if not ignore_cache:
+        cached = cache.get(key)
+        if cached:
+            logger.info("Using cached company page: %s", url)
+            return CompanyPageDetails.model_validate(cached)
+
+    company_details = await _on_background_loop(_scrape_company_page(url))
+    if company_details.founders:
+        cache.set(key, company_details.model_dump(mode="json"), expire=_COMPANY_CACHE_TTL)
+    return company_details
+
+
+async def _scrape_company_page(url: str) -> CompanyPageDetails:
     """
     Scrape a company page on workatastartup.com to extract founder information using Playwright
 
+    Like scrape_job_page, a plain HTTP fetch is tried first (escalating to Playwright
+    when no founders are found) and transient navigation failures are retried.
+
     Args:
         url: URL of the company page
 
     Returns:
         CompanyPageDetails object with extracted information
     """
-    logger.info(f"Scraping company page: {url}")
+    logger.info("Scraping company page: %s", url)
 
     # Initialize the return object with the URL
     company_details = CompanyPageDetails(company_url=url)
 
     try:
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=True)
-            context = await browser.new_context()
+        # Try plain HTTP first; the browser is only needed when the HTML has no founders
+        status, tree = await _fast_fetch(url)
+        if status in _DEAD_STATUSES:
+            logger.warning("Page not found (%s): %s", status, url)
+            return company_details
+        if tree is not None:
+            data = _parse_company_html(tree)
+            if data['founders']:
+                _apply_company_data(data, company_details)
+                logger.info("Successfully scraped company page without a browser: %s, found %s founders", url, len(company_details.founders))
+                return company_details
+
+        context = await _browser_pool.get_context()
+        try:
             page = await context.new_page()
 
-            try:
-                # Navigate to the company page
-                response = await page.goto(url, wait_until="networkidle")
-
-                # Check if page returned 404 Not Found or other error status
-                if response and (response.status >= 400 or not response.ok):
-                    logger.warning(f"Page returned status {response.status}: {url}")
-                    return company_details
-
-                # Extract company name only if not already set (normally it should be set from job page)
-                if not company_details.company_name:
-                    company_name_element = await page.query_selector('h1')
-                    if company_name_element:
-                        company_details.company_name = await company_name_element.inner_text()
-
-                # FOCUS ONLY ON FOUNDERS SECTION
-                # Look for the founders section directly - it usually has a heading
-                founders_section = await page.query_selector('h2:has-text("Founders"), h3:has-text("Founders"), h4:has-text("Founders")')
-
-                founders = []
-
-                if founders_section:
-                    # Get the container that has the founder profiles
-                    founders_container = await founders_section.evaluate('''
-                        el => {
-                            // Get the parent container that holds all founder profiles
-                            let container = el.nextElementSibling;
-                            return container ? container.outerHTML : null;
-                        }
-                    ''')
-
-                    if founders_container:
-                        # Extract all founder profiles from the container
-                        founder_profiles = await page.evaluate('''
-                            html => {
-                                const container = document.createElement('div');
-                                container.innerHTML = html;
-
-                                // Find all potential founder profile elements
-                                // They usually have an image, name, title, and LinkedIn link
-                                const profiles = [];
-
-                                // Look for LinkedIn links
-                                const linkedInLinks = container.querySelectorAll('a[href*="linkedin.com"]');
-
-                                for (const link of linkedInLinks) {
-                                    // For each LinkedIn link, find the surrounding profile info
-                                    let profileElement = link;
-                                    // Go up to likely profile container
-                                    for (let i = 0; i < 3; i++) {
-                                        if (!profileElement.parentElement) break;
-                                        profileElement = profileElement.parentElement;
-
-                                        // If this element has multiple children, it might be the profile container
-                                        if (profileElement.children.length >= 3) break;
-                                    }
-
-                                    // Extract profile information
-                                    const profile = {
-                                        name: null,
-                                        title: null,
-                                        linkedin_url: link.href
-                                    };
-
-                                    // Find name and title
-                                    const nameElements = profileElement.querySelectorAll('h3, h4, strong, b, p');
-                                    for (const el of nameElements) {
-                                        const text = el.innerText.trim();
-                                        // Skip elements with "founder" which is likely a title
-                                        if (text && text.length < 50 && !text.toLowerCase().includes('founder')) {
-                                            profile.name = text;
-                                            break;
-                                        }
-                                    }
-
-                                    // Find title
-                                    const titleElements = profileElement.querySelectorAll('p, div');
-                                    for (const el of titleElements) {
-                                        const text = el.innerText.trim();
-                                        if (text && (
-                                            text.toLowerCase().includes('founder') ||
-                                            text.toLowerCase().includes('ceo') ||
-                                            text.toLowerCase().includes('chief')
-                                        )) {
-                                            profile.title = text;
-                                            break;
-                                        }
-                                    }
-
-                                    // Only add if we have a LinkedIn URL
-                                    if (profile.linkedin_url) {
-                                        profiles.push(profile);
-                                    }
-                                }
-
-                                return profiles;
-                            }
-                        ''', founders_container)
-
-                        if founder_profiles:
-                            # Filter out duplicates
-                            seen_links = set()
-                            for profile in founder_profiles:
-                                if profile.get('linkedin_url') and profile['linkedin_url'] not in seen_links:
-                                    seen_links.add(profile['linkedin_url'])
-
-                                    # If no title was found but we have LinkedIn, set a default title
-                                    if not profile.get('title') and profile.get('linkedin_url'):
-                                        profile['title'] = "Co-founder"
-
-                                    founders.append(profile)
-
-                # If we couldn't find founders through the section heading, try a direct search for LinkedIn links
-                if not founders:
-                    # Look for all LinkedIn links on the page
-                    linkedin_links = await page.query_selector_all('a[href*="linkedin.com"]')
-
-                    for link in linkedin_links:
-                        try:
-                            # Check if this link is related to a founder
-                            is_founder_link = await link.evaluate('''
-                                link => {
-                                    // Check surrounding text for founder-related terms
-                                    let element = link;
-                                    for (let i = 0; i < 3; i++) {
-                                        if (!element.parentElement) break;
-                                        element = element.parentElement;
-
-                                        if (element.innerText && (
-                                            element.innerText.toLowerCase().includes('founder') ||
-                                            element.innerText.toLowerCase().includes('ceo') ||
-                                            element.innerText.toLowerCase().includes('chief')
-                                        )) {
-                                            return true;
-                                        }
-                                    }
-                                    return false;
-                                }
-                            ''')
-
-                            if is_founder_link:
-                                linkedin_url = await link.get_attribute('href')
-
-                                # Get surrounding text to extract name and title
-                                profile_info = await link.evaluate('''
-                                    link => {
-                                        let element = link;
-                                        for (let i = 0; i < 3; i++) {
-                                            if (!element.parentElement) break;
-                                            element = element.parentElement;
-                                        }
-
-                                        // Extract information
-                                        const name = element.querySelector('h3, h4, strong, b')?.innerText.trim() || null;
-
-                                        // Find title in paragraphs or divs
-                                        let title = null;
-                                        const elements = element.querySelectorAll('p, div');
-                                        for (const el of elements) {
-                                            if (el.innerText && (
-                                                el.innerText.toLowerCase().includes('founder') ||
-                                                el.innerText.toLowerCase().includes('ceo') ||
-                                                el.innerText.toLowerCase().includes('chief')
-                                            )) {
-                                                title = el.innerText.trim();
-                                                break;
-                                            }
-                                        }
-
-                                        return { name, title };
-                                    }
-                                ''')
-
-                                # Create founder profile
-                                founder = {
-                                    'linkedin_url': linkedin_url
-                                }
-
-                                if profile_info.get('name'):
-                                    founder['name'] = profile_info['name']
-
-                                if profile_info.get('title'):
-                                    founder['title'] = profile_info['title']
-                                else:
-                                    founder['title'] = "Co-founder"  # Default title
-
-                                # Check for duplicates
-                                if not any(f.get('linkedin_url') == linkedin_url for f in founders):
-                                    founders.append(founder)
-
-                        except Exception as e:
-                            logger.warning(f"Error processing LinkedIn link: {str(e)}")
-
-                company_details.founders = founders
-
-            except PlaywrightError as e:
-                # Handle Playwright-specific errors
-                if "404" in str(e) or "Page not found" in str(e):
-                    logger.warning(f"Page not found (404): {url}")
-                else:
-                    logger.error(f"Playwright error scraping company page {url}: {str(e)}")
-
-            await browser.close()
-
-        logger.info(f"Successfully scraped company page: {url}, found {len(founders)} founders")
+            # Navigate to the company page
+            response = await _goto_with_retry(page, url)
+
+            # Check if page returned 404 Not Found or other error status
+            if response and (response.status >= 400 or not response.ok):
+                logger.warning("Page returned status %s: %s", response.status, url)
+            else:
+                await _wait_for_content(page, _COMPANY_READY_SELECTOR, url)
+                await _extract_company_details(page, company_details)
+
+        except PlaywrightError as e:
+            # Handle Playwright-specific errors
+            if "404" in str(e) or "Page not found" in str(e):
+                logger.warning("Page not found (404): %s", url)
+            else:
+                logger.error("Playwright error scraping company page %s: %s", url, e)
+
+        finally:
+            await _browser_pool.release(context)
+
+        logger.info("Successfully scraped company page: %s, found %s founders", url, len(company_details.founders))
         return company_details
 
-    except Exception as e:
-        import traceback
-        tb = traceback.format_exc()
-        logger.error(f"Error scraping company page {url}: {str(e)}\nTraceback:\n{tb}")
+    except Exception:
+        logger.exception("Error scraping company page %s", url)
         return company_details
 
 
-def find_contact_linkedin(company_details: CompanyPageDetails, job_details: Optional[JobPageDetails] = None) -> Optional[str]:
+async def _scrape_bulk(scrape_func, urls: List[str]) -> List[Union[JobPageDetails, CompanyPageDetails, BaseException]]:
+    """Run scrape_func over urls concurrently, capped at SCRAPE_CONCURRENCY pages at a time"""
+    # A limit below 1 would leave every scrape waiting on the semaphore forever
+    semaphore = asyncio.Semaphore(max(1, int(os.environ.get("SCRAPE_CONCURRENCY", _DEFAULT_SCRAPE_CONCURRENCY))))
+
+    async def _one(url: str):
+        async with semaphore:
+            return await scrape_func(url)
+
+    return await asyncio.gather(*(_one(url) for url in urls), return_exceptions=True)
+
+
+async def scrape_jobs_bulk(urls: List[str]) -> List[Union[JobPageDetails, BaseException]]:
+    """
+    Scrape many job listing pages concurrently over the shared browser
+
+    At most SCRAPE_CONCURRENCY pages (default 5) are open at once, each in its own
+    browser context, so network waits overlap without launching extra browsers.
+
+    Args:
+        urls: URLs of the job listing pages
+
+    Returns:
+        Results in the same order as urls; a failed scrape yields its exception
+    """
+    logger.info("Bulk scraping %s job pages", len(urls))
+    return await _scrape_bulk(scrape_job_page, urls)
+
+
+async def scrape_companies_bulk(urls: List[str]) -> List[Union[CompanyPageDetails, BaseException]]:
+    """
+    Scrape many company pages concurrently over the shared browser
+
+    Concurrency is capped by SCRAPE_CONCURRENCY (default 5), as in scrape_jobs_bulk.
+
+    Args:
+        urls: URLs of the company pages
+
+    Returns:
+        Results in the same order as urls; a failed scrape yields its exception
+    """
+    logger.info("Bulk scraping %s company pages", len(urls))
+    return await _scrape_bulk(scrape_company_page, urls)
+
+
+def find_contact_linkedin(
+    company_details: Union[CompanyPageDetails, Dict[str, Any]],
+    job_details: Optional[Union[JobPageDetails, Dict[str, Any]]] = None,
+) -> Optional[str]:
     """
     Identify the best contact's LinkedIn URL from the company page details.
     Focus ONLY on founders/CEOs, not hiring managers.
 
     Args:
-        company_details: CompanyPageDetails object with company and founder info
-        job_details: Optional JobPageDetails that might contain additional clues
+        company_details: CompanyPageDetails object (or its dict form) with company and founder info
+        job_details: Optional JobPageDetails (or dict) that might contain additional clues; currently unused
 
     Returns:
         LinkedIn URL of the best contact, or None if not found
     """
-    # No need to convert if it's already a CompanyPageDetails object
-    if not isinstance(company_details, CompanyPageDetails):
-        company_details = CompanyPageDetails(**company_details)
-
-    if job_details and not isinstance(job_details, JobPageDetails):
-        job_details = JobPageDetails(**job_details)
+    # Read founders from whichever form we were given rather than re-validating a model
+    if isinstance(company_details, dict):
+        founders = company_details.get('founders') or []
+    else:
+        founders = company_details.founders
 
     # If we have no founders, we can't find a contact
-    if not company_details.founders:
+    if not founders:
         return None
 
-    # First, look for CEO or primary founder
-    for founder in company_details.founders:
-        title = founder.get('title', '').lower()
-        if title and ('ceo' in title or 'chief' in title):
-            return founder.get('linkedin_url')
-
-    # Next, look for any co-founder
-    for founder in company_details.founders:
-        title = founder.get('title', '').lower()
-        if title and 'founder' in title:
-            return founder.get('linkedin_url')
-
-    # If no CEO or specific founder title found, return the first founder with a LinkedIn URL
-    for founder in company_details.founders:
-        if founder.get('linkedin_url'):
-            return founder.get('linkedin_url')
+    # Single pass: a CEO/chief wins outright, otherwise remember the first co-founder
+    # and the first founder with a LinkedIn URL as fallbacks
+    founder_url = first_url = None
+    for founder in founders:
+        linkedin_url = founder.get('linkedin_url')
+        if not linkedin_url:
+            continue
+        title = (founder.get('title') or '').lower()
+        if 'ceo' in title or 'chief' in title:
+            return linkedin_url
+        if founder_url is None and 'founder' in title:
+            founder_url = linkedin_url
+        if first_url is None:
+            first_url = linkedin_url
+
+    # None if no founder has a LinkedIn URL
+    return founder_url or first_url
+
+
+# Event loop that owns the browser pool and HTTP client, running in a daemon thread so
+# they stay warm between calls; the sync wrappers and async tools all scrape on it
+_background_loop: Optional[asyncio.AbstractEventLoop] = None
+_background_loop_lock = threading.Lock()
+
+
+def _get_background_loop() -> asyncio.AbstractEventLoop:
+    """Return the shared background event loop, starting its thread on first use"""
+    global _background_loop
+    if _background_loop is None:
+        with _background_loop_lock:
+            if _background_loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="scraping-loop", daemon=True).start()
+                _background_loop = loop
+    return _background_loop
+
+
+async def _on_background_loop(coro):
+    """
+    Await coro on the shared background loop, whichever loop the caller runs on
 
-    # No suitable LinkedIn URL found
-    return None
+    The browser pool and HTTP client belong to the background loop, so the async
+    tools hand their browser and network work over to it instead of creating (and
+    leaking) a browser per caller loop.
+    """
+    loop = _get_background_loop()
+    if asyncio.get_running_loop() is loop:
+        return await coro
+    return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, loop))
 
 
 # Helper function to run async functions
 def run_async(async_func, *args, **kwargs):
-    """Run an async function synchronously"""
-    loop = asyncio.get_event_loop()
-    return loop.run_until_complete(async_func(*args, **kwargs))
+    """Run an async function synchronously on the shared background event loop"""
+    return asyncio.run_coroutine_threadsafe(async_func(*args, **kwargs), _get_background_loop()).result()
 
 
 # Synchronous wrappers for the async functions
-def scrape_job_page_sync(url: str) -> JobPageDetails:
+def scrape_job_page_sync(url: str, ignore_cache: bool = False) -> JobPageDetails:
     """Synchronous wrapper for scrape_job_page"""
-    return run_async(scrape_job_page, url)
+    return run_async(scrape_job_page, url, ignore_cache=ignore_cache)
 
 
-def scrape_company_page_sync(url: str) -> CompanyPageDetails:
+def scrape_company_page_sync(url: str, ignore_cache: bool = False) -> CompanyPageDetails:
     """Synchronous wrapper for scrape_company_page"""
-    return run_async(scrape_company_page, url)
\ No newline at end of file
+    return run_async(scrape_company_page, url, ignore_cache=ignore_cache)
\ No newline at end of file
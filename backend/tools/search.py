@@ -2,117 +2,337 @@
 Search tools for generating and executing Google search queries
 """
 import requests
-from typing import List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import Dict, List, Optional, Tuple
 import logging
 from ..models import JobQuery
 import os
+import tempfile
+import threading
+import time
+import diskcache
+import orjson
 
 logger = logging.getLogger(__name__)
 
+_SERP_API_URL = "https://serpapi.com/search"
+
+# Base dork always targets workatastartup.com
+_BASE_DORK = "site:workatastartup.com"
+
+# URL prefixes that mark a search result as a workatastartup.com job listing
+_ALLOW_PREFIXES = ("https://www.workatastartup.com/jobs/", "https://workatastartup.com/jobs/")
+
+# Most SERP API requests in flight at once
+_MAX_SERP_WORKERS = 8
+
+# (connect, read) timeout for SERP API calls
+_SERP_TIMEOUT = (3.05, 10)
+
+# Default for SERP_MAX_PAGES, the most result pages fetched per dork in one search.
+# Every page is a paid SERP API call, so paging further is opt-in
+_DEFAULT_SERP_MAX_PAGES = 1
+
+# How long SERP results for a dork are reused from the on-disk cache (SERP_CACHE_DIR)
+_SERP_CACHE_TTL = 6 * 3600
+
+# Seconds a SERP API key sits out of the rotation after being rate limited
+_SERP_KEY_COOLDOWN = 60
+
+# Shared session so dorks reuse pooled TLS connections to serpapi.com; transient
+# failures are retried by urllib3 with backoff. 429s are left to _fetch, which
+# rotates to another API key instead of retrying the rate-limited one
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=8,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=(500, 502, 503, 504)),
+))
+
+
+class SerpKeyPool:
+    """
+    Round-robin over SERP API keys, skipping keys that were recently rate limited
+
+    Keys come from SERP_API_KEYS (comma separated), falling back to SERP_API_KEY,
+    and are read on first use so .env values loaded at startup are picked up.
+    """
+
+    def __init__(self, cooldown: float = _SERP_KEY_COOLDOWN):
+        self._cooldown = cooldown
+        self._keys: Optional[List[str]] = None
+        self._index = 0
+        self._cold_until: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def _load_keys(self) -> List[str]:
+        if self._keys is None:
+            keys = [key.strip() for key in os.environ.get("SERP_API_KEYS", "").split(",") if key.strip()]
+            if not keys and os.environ.get("SERP_API_KEY"):
+                keys = [os.environ["SERP_API_KEY"]]
+            self._keys = keys
+        return self._keys
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._load_keys())
+
+    def next_key(self) -> Optional[str]:
+        """Return the next key not cooling down (or the least recently limited one if all are)"""
+        with self._lock:
+            keys = self._load_keys()
+            if not keys:
+                return None
+
+            now = time.monotonic()
+            for _ in range(len(keys)):
+                key = keys[self._index % len(keys)]
+                self._index += 1
+                if self._cold_until.get(key, 0) <= now:
+                    return key
+
+            # Every key is cooling down; use the one that recovers first
+            return min(keys, key=lambda key: self._cold_until.get(key, 0))
+
+    def mark_cold(self, key: str) -> None:
+        """Take key out of the rotation for the cooldown period"""
+        with self._lock:
+            self._cold_until[key] = time.monotonic() + self._cooldown
+
+
+_serp_keys = SerpKeyPool()
+
+_serp_cache: Optional[diskcache.Cache] = None
+
+
+def _get_serp_cache() -> diskcache.Cache:
+    """Return the on-disk SERP cache, opening it under SERP_CACHE_DIR on first use"""
+    global _serp_cache
+    if _serp_cache is None:
+        directory = os.environ.get("SERP_CACHE_DIR") or os.path.join(tempfile.gettempdir(), "serp_cache")
+        _serp_cache = diskcache.Cache(directory)
+    return _serp_cache
+
+
 def generate_google_dorks(query: JobQuery) -> List[str]:
     """
     Generate Google search queries (dorks) based on the structured job query
 
     Args:
-        query: A JobQuery object containing search parameters
+        query: A JobQuery object (or its dict form) containing search parameters
 
     Returns:
         A list of Google search query strings
     """
-    # Base dork always targets workatastartup.com
-    base_dork = "site:workatastartup.com"
-    logger.info(f"Generating Google dorks for query: {query}")
-    # transform the query dict to JobQuery object
-    query = JobQuery(**query)
-    # Add role search
-    dorks = []
+    logger.info("Generating Google dorks for query: %s", query)
+    # Agents may pass the query as a dict; only validate it in that case
+    if not isinstance(query, JobQuery):
+        query = JobQuery(**query)
 
-    # Main dork with all components
-    main_dork = f"{base_dork} {query.role}"
+    # Location suffix shared by every dork
+    location = f" \"{query.location}\"" if query.location else ""
 
-    # Add location if it's not empty
-    if query.location:
-        main_dork += f" \"{query.location}\""
-
-    dorks.append(main_dork)
+    # Main dork with all components
+    dorks = [f"{_BASE_DORK} {query.role}{location}"]
 
     # Add variations if needed
     if query.role:
         # Try with quotes for exact match
-        exact_role_dork = f"{base_dork} \"{query.role}\""
-        if query.location:
-            exact_role_dork += f" \"{query.location}\""
-        dorks.append(exact_role_dork)
+        dorks.append(f"{_BASE_DORK} \"{query.role}\"{location}")
 
         # Try with "jobs" in the query
-        jobs_dork = f"{base_dork} {query.role} jobs"
-        if query.location:
-            jobs_dork += f" \"{query.location}\""
-        dorks.append(jobs_dork)
+        dorks.append(f"{_BASE_DORK} {query.role} jobs{location}")
 
-    logger.info(f"Generated {len(dorks)} Google dorks for query: {query.raw_query}")
+    logger.info("Generated %s Google dorks for query: %s", len(dorks), query.raw_query)
     return dorks
 
 
-def execute_google_search(dorks: List[str], limit: int = 10, start_index: int = 0) -> Tuple[List[str], int]:
+def _fetch_page(dork: str, num: int, start: int, force_refresh: bool = False) -> Tuple[List[str], int]:
     """
-    Execute Google search using SERP API and extract job URLs
+    Fetch one page of SERP API results for a dork and extract the workatastartup.com job URLs
+
+    Successful lookups are cached on disk for a few hours, keyed by dork, offset and result count.
+
+    Args:
+        dork: Google search query string
+        num: Number of results to request
+        start: Offset of the first result to request
+        force_refresh: Call the SERP API even if a cached result exists
+
+    Returns:
+        Tuple of (job URLs in result order, number of organic results on the page);
+        both empty/zero if the request failed
+    """
+    cache = _get_serp_cache()
+    key = f"{num}:{start}:{dork}"
+    if not force_refresh:
+        cached = cache.get(key)
+        if cached is not None:
+            logger.info("Using cached SERP results for query: %s (start %s)", dork, start)
+            return cached
+
+    job_urls = []
+
+    try:
+        # Call SERP API for Google search
+        params = {
+            "engine": "google",
+            "q": dork,
+            "num": num,
+            "start": start,
+        }
+
+        logger.info("Calling SERP API with query: %s (start %s)", dork, start)
+        # On a 429 the key is benched and the request retried with the next one
+        for _ in range(max(1, len(_serp_keys))):
+            api_key = _serp_keys.next_key()
+            params["api_key"] = api_key
+            response = _SESSION.get(_SERP_API_URL, params=params, timeout=_SERP_TIMEOUT)
+            if response.status_code != 429 or api_key is None:
+                break
+            logger.warning("SERP API key rate limited, cooling it down for %ss", _SERP_KEY_COOLDOWN)
+            _serp_keys.mark_cold(api_key)
+        response.raise_for_status()
+
+        # orjson parses the SERP payload several times faster than response.json()
+        data = orjson.loads(response.content)
+
+        # Extract organic results
+        organic_results = data.get("organic_results", [])
+
+        seen = set()
+        for result in organic_results:
+            url = result.get("link", "")
+
+            # Filter for job URLs from workatastartup.com
+            if url.startswith(_ALLOW_PREFIXES) and url not in seen:
+                seen.add(url)
+                job_urls.append(url)
+
+        # Only the extracted URLs are kept, not the full response
+        page = (job_urls, len(organic_results))
+        cache.set(key, page, expire=_SERP_CACHE_TTL)
+        return page
+
+    except requests.RequestException as e:
+        logger.error("Error calling SERP API: %s", e)
+
+    except Exception as e:
+        logger.exception("Unexpected error during SERP API search: %s", e)
+
+    return job_urls, 0
+
+
+def _fetch(dork: str, num: int, start: int, wanted: int, force_refresh: bool = False) -> Tuple[List[str], int]:
+    """
+    Page through SERP API results for a dork until enough job URLs are found
+
+    Args:
+        dork: Google search query string
+        num: Number of results to request per page
+        start: Offset of the first result to request
+        wanted: Number of job URLs to collect before stopping
+        force_refresh: Call the SERP API even if cached results exist
+
+    Returns:
+        Tuple of (job URLs in result order, offset of the first result not yet read)
+    """
+    job_urls = []
+    seen = set()
+    offset = start
+    max_pages = max(1, int(os.environ.get("SERP_MAX_PAGES", _DEFAULT_SERP_MAX_PAGES)))
+
+    for _ in range(max_pages):
+        page_urls, count = _fetch_page(dork, num, offset, force_refresh)
+        offset += count
+        for url in page_urls:
+            if url not in seen:
+                seen.add(url)
+                job_urls.append(url)
+
+        # A short page means the dork has no more results
+        if len(job_urls) >= wanted or count < num:
+            break
+
+    return job_urls, offset
+
+
+def search_job_urls(dorks: List[str], limit: int = 10, start_index: int = 0, force_refresh: bool = False) -> Tuple[List[str], int]:
+    """
+    Search for job URLs with the SERP API and return them with a paging cursor
+
+    Dorks are sent concurrently; results are merged in dork order, so the output
+    matches what running them one after another would give. Each dork starts at
+    start_index and pages forward (up to SERP_MAX_PAGES pages) until it yields
+    its share of the limit. The
+    returned index is the smallest offset any dork reached, so a later call with
+    it doesn't skip results a slower dork never returned (faster dorks may
+    repeat a few URLs instead).
 
     Args:
         dorks: List of Google search query strings
         limit: Maximum number of results to return
         start_index: Index to start from (for pagination/continuation)
+        force_refresh: Bypass the SERP result cache
 
     Returns:
         A tuple containing (list of job URLs from workatastartup.com, next start index)
     """
-    job_urls = []
+    if not dorks:
+        return [], start_index
+
     results_per_dork = max(1, limit // len(dorks))
+    # Request more results as some may not be relevant
+    num = results_per_dork * 2
 
-    for dork in dorks:
-        if len(job_urls) >= limit:
-            break
+    with ThreadPoolExecutor(max_workers=min(len(dorks), _MAX_SERP_WORKERS)) as executor:
+        results = list(executor.map(
+            lambda dork: _fetch(dork, num, start_index, results_per_dork, force_refresh), dorks
+        ))
 
-        try:
-            # Call SERP API for Google search
-            params = {
-                "engine": "google",
-                "q": dork,
-                "api_key": os.environ.get("SERP_API_KEY"),
-                "num": results_per_dork * 2,  # Request more results as some may not be relevant
-            }
+    # Flatten in dork order, dropping duplicates and stopping once limit is reached
+    seen = set()
+    unique_urls = (url for urls, _ in results for url in urls if not (url in seen or seen.add(url)))
+    job_urls = list(islice(unique_urls, limit))
+    for url in job_urls:
+        logger.info("Found job URL: %s", url)
 
-            logger.info(f"Calling SERP API with query: {dork}")
-            response = requests.get("https://serpapi.com/search", params=params)
-            response.raise_for_status()
+    # Resume from the offset the slowest dork reached, so none of its results are skipped
+    next_start = min(offset for _, offset in results)
 
-            data = response.json()
+    logger.info("Found %s job URLs, next start index: %s", len(job_urls), next_start)
+    return job_urls, next_start
 
-            # Extract organic results
-            organic_results = data.get("organic_results", [])
 
-            for result in organic_results:
-                url = result.get("link", "")
+def execute_google_search(dorks: List[str], limit: int = 10, start_index: int = 0, force_refresh: bool = False) -> List[str]:
+    """
+    Execute Google search using SERP API and extract job URLs
 
-                # Filter for job URLs from workatastartup.com
-                if url and 'workatastartup.com/jobs/' in url:
-                    if url not in job_urls:
-                        job_urls.append(url)
-                        logger.info(f"Found job URL: {url}")
-                        if len(job_urls) >= limit:
-                            break
+    Args:
+        dorks: List of Google search query strings
+        limit: Maximum number of results to return
+        start_index: Index to start from (for pagination/continuation)
+        force_refresh: Bypass the SERP result cache
 
-        except requests.RequestException as e:
-            logger.error(f"Error calling SERP API: {str(e)}")
-            # Continue with the next dork
+    Returns:
+        List of job URLs from workatastartup.com; use search_job_urls to also get
+        the start index for the next page
+    """
+    job_urls, _ = search_job_urls(dorks, limit, start_index, force_refresh)
+    return job_urls
 
-        except Exception as e:
-            import traceback
-            tb = traceback.format_exc()
-            logger.error(f"Unexpected error during SERP API search: {str(e)}\nTraceback:\n{tb}")
-            # Continue with the next dork
 
-    logger.info(f"Found {len(job_urls)} job URLs")
-    return job_urls[:limit]
+def _prewarm() -> None:
+    """Open a pooled connection to serpapi.com so the first search skips the handshake"""
+    try:
+        _SESSION.head(_SERP_API_URL, timeout=_SERP_TIMEOUT)
+    except Exception as e:
+        logger.debug("SERP API prewarm failed: %s", e)
 
 
+def prewarm() -> None:
+    """Warm the SERP API connection pool in a background thread"""
+    threading.Thread(target=_prewarm, name="serp-prewarm", daemon=True).start()
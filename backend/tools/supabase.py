@@ -1,18 +1,43 @@
 """
 Supabase integration tools for database operations
 """
-import os
 import logging
-from typing import Optional, List, Dict, Any
+import atexit
+import queue
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
 import supabase
+from postgrest.types import ReturnMethod
 from supabase import create_client, Client
 from ..models import Job, Lead, EmailTemplate, EmailLog
+from .supabase_common import (
+    RETRY_ATTEMPTS, TEMPLATE_COLUMNS, build_lead_rows, email_log_row, get_cached_template,
+    get_supabase_config, invalidate_templates, is_transient, map_lead_ids,
+    reset_supabase_config, retry_delay, set_cached_template, status_update,
+    url_less_company_names,
+)
 
 logger = logging.getLogger(__name__)
 
+# Columns returned for similar-job lookups: enough to resume a previous search
+_SIMILAR_JOB_COLUMNS = "id, created_at, parsed_role, parsed_location, google_dorks, status, last_processed_index"
+
+# Job model fields that aren't columns of the jobs table
+_JOB_EXCLUDE = frozenset({"id", "leads"})
+
+# Shared client, created on first use by get_supabase_client
+_client: Optional[Client] = None
+_client_lock = threading.Lock()
+
 def get_supabase_client() -> Client:
     """
-    Get a Supabase client instance
+    Get the shared Supabase client instance
+
+    The client is created on first use and reused afterwards, so its HTTP
+    connections stay pooled. Creation is guarded by a lock so concurrent first
+    calls from worker threads still build a single client.
 
     Returns:
         Supabase Client instance
@@ -20,50 +45,212 @@ def get_supabase_client() -> Client:
     Raises:
         ValueError: If Supabase URL or API key are not configured
     """
-    supabase_url = os.environ.get("SUPABASE_URL")
-    supabase_key = os.environ.get("SUPABASE_ANON_KEY")
-
-    if not supabase_url or not supabase_key:
-        error_msg = "Supabase URL and key must be provided as environment variables"
-        logger.error(error_msg)
-        raise ValueError(error_msg)
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                config = get_supabase_config()
+                _client = create_client(config.url, config.key)
+    return _client
+
+# Request builders of the shared client by table name; they hold no per-query
+# state, so one per table can be reused for every query
+_tables: Dict[str, Any] = {}
+
+def _table(name: str) -> Any:
+    """Get the shared client's request builder for a table, creating it on first use"""
+    builder = _tables.get(name)
+    if builder is None:
+        builder = _tables.setdefault(name, get_supabase_client().table(name))
+    return builder
+
+def reset_supabase_client() -> None:
+    """Drop the shared client, table builders and cached config so the next call rebuilds them"""
+    global _client
+    with _client_lock:
+        _client = None
+        _tables.clear()
+        reset_supabase_config()
+
+# Most items per batched write, and the longest a batch of concurrent submits waits to fill (seconds)
+_BATCH_MAX_SIZE = 100
+_BATCH_WAIT = 0.02
+
+class _Batcher:
+    """
+    Coalesce writes submitted from any thread into batched database calls
+
+    A background thread hands queued items to write() in one call. An item that
+    arrives alone is written straight away, so a sequential caller never waits on
+    the batch window; when others are already queued with it, the batch keeps
+    filling until _BATCH_MAX_SIZE are waiting or _BATCH_WAIT seconds have passed.
+    Each submit() returns a Future resolved with that item's result.
+    With a key function, items are written in one call per distinct key instead.
+    If a write fails, each of its items is written again on its own, so one bad
+    row only fails its own caller.
+    """
 
-    return create_client(supabase_url, supabase_key)
+    def __init__(self, name: str, write: Callable[[List[Any]], List[Any]],
+                 key: Optional[Callable[[Any], Any]] = None,
+                 max_size: int = _BATCH_MAX_SIZE, wait: float = _BATCH_WAIT):
+        self._name = name
+        self._write = write
+        self._key = key
+        self._max_size = max_size
+        self._wait = wait
+        self._queue: "queue.Queue[Tuple[Any, Future]]" = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def submit(self, item: Any) -> Future:
+        """Queue item for the next batch and return a Future for its result"""
+        if self._worker is None:
+            with self._lock:
+                if self._worker is None:
+                    self._worker = threading.Thread(target=self._run, name=f"{self._name}-batcher", daemon=True)
+                    self._worker.start()
+        future: Future = Future()
+        self._queue.put((item, future))
+        return future
+
+    def flush(self) -> None:
+        """Block until every submitted item has been written (or failed)"""
+        if self._worker is not None:
+            self._queue.join()
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            # Take whatever queued up meanwhile (e.g. during the previous write)
+            while len(batch) < self._max_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            # Only wait for stragglers when submits are evidently concurrent
+            deadline = time.monotonic() + (self._wait if len(batch) > 1 else 0)
+            while len(batch) < self._max_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            try:
+                if self._key is None:
+                    self._write_batch(batch)
+                else:
+                    groups: Dict[Any, List[Tuple[Any, Future]]] = {}
+                    for entry in batch:
+                        groups.setdefault(self._key(entry[0]), []).append(entry)
+                    for group in groups.values():
+                        self._write_batch(group)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _write_batch(self, batch: List[Tuple[Any, Future]]) -> None:
+        if len(batch) == 1:
+            self._write_one(*batch[0])
+            return
+
+        try:
+            results = self._write([item for item, _ in batch])
+        except Exception as e:
+            logger.warning("Error writing %s batch of %s items, retrying one at a time: %s", self._name, len(batch), e)
+            for item, future in batch:
+                self._write_one(item, future)
+            return
+
+        for (_, future), result in zip(batch, results):
+            future.set_result(result)
+
+    def _write_one(self, item: Any, future: Future) -> None:
+        try:
+            future.set_result(self._write([item])[0])
+        except Exception as e:
+            logger.exception("Error writing %s item: %s", self._name, e)
+            future.set_exception(e)
+
+# Background writer for status updates whose result the caller doesn't wait on;
+# shut down at exit so queued writes still reach the database
+_writer = ThreadPoolExecutor(max_workers=4, thread_name_prefix="sb-writer")
+atexit.register(_writer.shutdown)
+
+def _with_retries(call: Callable[[], Any], idempotent: bool = True) -> Any:
+    """
+    Run a database call, retrying transient failures with jittered exponential backoff
 
-def log_job_start(job: Job) -> str:
+    Pass idempotent=False for writes that could fail or apply twice if repeated
+    after the first response was lost (plain inserts, or upserts that can hit a
+    unique constraint other than their on_conflict target); those are only
+    retried when the request was never sent.
     """
-    Log a new job start to the database
+    for attempt in range(1, RETRY_ATTEMPTS + 1):
+        try:
+            return call()
+        except Exception as e:
+            if attempt == RETRY_ATTEMPTS or not is_transient(e, idempotent):
+                raise
+            delay = retry_delay(attempt)
+            logger.warning("Transient Supabase error (attempt %s/%s), retrying in %.2fs: %s", attempt, RETRY_ATTEMPTS, delay, e)
+            time.sleep(delay)
+
+def _execute(query: Any, idempotent: bool = True) -> Any:
+    """Execute a PostgREST query builder with retries on transient failures (see _with_retries)"""
+    return _with_retries(query.execute, idempotent)
+
+def _insert(table: str, row: Dict[str, Any]) -> Optional[str]:
+    """
+    Insert one row and return its generated ID
 
-    Args:
-        job: Job object with query details
+    A plain insert isn't idempotent, so it is only retried if it never reached the server.
 
     Returns:
-        ID of the created job record
+        ID of the created record, or None if the insert failed
     """
     try:
-        client = get_supabase_client()
+        response = _execute(_table(table).insert(row), idempotent=False)
+    except Exception as e:
+        logger.exception("Error inserting into %s: %s", table, e)
+        return None
 
-        # Convert Job object to dict for insertion
-        job_data = job.dict(exclude={"id", "leads"})
+    if response.data:
+        return response.data[0].get("id")
 
-        # Insert the job record
-        logger.info(f"Logging new job: {job.raw_query}")
-        response = client.table("jobs").insert(job_data).execute()
+    logger.error("Failed to get %s ID from Supabase response", table)
+    return None
 
-        # Extract the job ID from the response
-        if response.data and len(response.data) > 0:
-            job_id = response.data[0].get("id")
-            logger.info(f"Job logged with ID: {job_id}")
-            return job_id
-        else:
-            logger.error("Failed to get job ID from Supabase response")
-            return None
+def _update(table: str, row_id: str, row: Dict[str, Any]) -> bool:
+    """
+    Update the columns in row for the record with the given ID
 
+    Returns:
+        True if update succeeded, False otherwise
+    """
+    try:
+        _execute(_table(table).update(row, returning=ReturnMethod.minimal).eq("id", row_id))
+        return True
     except Exception as e:
-        import traceback
-        tb = traceback.format_exc()
-        logger.error(f"Error logging job start: {str(e)}\nTraceback:\n{tb}")
-        return None
+        logger.exception("Error updating %s %s: %s", table, row_id, e)
+        return False
+
+def log_job_start(job: Job) -> Optional[str]:
+    """
+    Log a new job start to the database
+
+    Args:
+        job: Job object with query details
+
+    Returns:
+        ID of the created job record, or None if failed
+    """
+    logger.info("Logging new job: %s", job.raw_query)
+    job_id = _insert("jobs", job.model_dump(mode="json", exclude=_JOB_EXCLUDE, exclude_none=True))
+    if job_id:
+        logger.info("Job logged with ID: %s", job_id)
+    return job_id
 
 def update_job_status(job_id: str, status: str, error_message: Optional[str] = None) -> bool:
     """
@@ -77,25 +264,24 @@ def update_job_status(job_id: str, status: str, error_message: Optional[str] = N
     Returns:
         True if update succeeded, False otherwise
     """
-    try:
-        client = get_supabase_client()
+    logger.info("Updating job %s status to: %s", job_id, status)
+    return _update("jobs", job_id, status_update(status, error_message=error_message))
 
-        # Prepare update data
-        update_data = {"status": status}
-        if error_message:
-            update_data["error_message"] = error_message
+def update_job_status_async(job_id: str, status: str, error_message: Optional[str] = None) -> Future:
+    """
+    Update the status of a job on the background writer without waiting for it
 
-        # Update the job record
-        logger.info(f"Updating job {job_id} status to: {status}")
-        response = client.table("jobs").update(update_data).eq("id", job_id).execute()
+    Writes submitted this way may land out of order relative to each other.
 
-        return True
+    Args:
+        job_id: ID of the job to update
+        status: New status value
+        error_message: Optional error message
 
-    except Exception as e:
-        import traceback
-        tb = traceback.format_exc()
-        logger.error(f"Error updating job status: {str(e)}\nTraceback:\n{tb}")
-        return False
+    Returns:
+        Future resolved with update_job_status's result
+    """
+    return _writer.submit(update_job_status, job_id, status, error_message)
 
 def update_job_search_index(job_id: str, last_processed_index: int) -> bool:
     """
@@ -108,23 +294,8 @@ def update_job_search_index(job_id: str, last_processed_index: int) -> bool:
     Returns:
         True if update succeeded, False otherwise
     """
-    try:
-        client = get_supabase_client()
-
-        # Prepare update data
-        update_data = {"last_processed_index": last_processed_index}
-
-        # Update the job record
-        logger.info(f"Updating job {job_id} last_processed_index to: {last_processed_index}")
-        response = client.table("jobs").update(update_data).eq("id", job_id).execute()
-
-        return True
-
-    except Exception as e:
-        import traceback
-        tb = traceback.format_exc()
-        logger.error(f"Error updating job search index: {str(e)}\nTraceback:\n{tb}")
-        return False
+    logger.info("Updating job %s last_processed_index to: %s", job_id, last_processed_index)
+    return _update("jobs", job_id, {"last_processed_index": last_processed_index})
 
 def get_job_last_index(job_id: str) -> int:
     """
@@ -137,25 +308,21 @@ def get_job_last_index(job_id: str) -> int:
         Last processed index or 0 if not found
     """
     try:
-        client = get_supabase_client()
-
         # Query for the job
-        logger.info(f"Fetching last_processed_index for job: {job_id}")
-        response = client.table("jobs").select("last_processed_index").eq("id", job_id).execute()
+        logger.info("Fetching last_processed_index for job: %s", job_id)
+        response = _execute(_table("jobs").select("last_processed_index").eq("id", job_id))
 
         # Extract the last processed index
         if response.data and len(response.data) > 0:
             last_index = response.data[0].get("last_processed_index", 0)
-            logger.info(f"Retrieved last_processed_index: {last_index}")
+            logger.info("Retrieved last_processed_index: %s", last_index)
             return last_index
         else:
-            logger.warning(f"No job found with ID: {job_id}")
+            logger.warning("No job found with ID: %s", job_id)
             return 0
 
     except Exception as e:
-        import traceback
-        tb = traceback.format_exc()
-        logger.error(f"Error getting job last index: {str(e)}\nTraceback:\n{tb}")
+        logger.exception("Error getting job last index: %s", e)
         return 0
 
 def get_similar_job(role: str, location: str) -> Optional[Dict[str, Any]]:
@@ -167,33 +334,30 @@ def get_similar_job(role: str, location: str) -> Optional[Dict[str, Any]]:
         location: Job location
 
     Returns:
-        Job record if found, None otherwise
+        Job record (the _SIMILAR_JOB_COLUMNS fields) if found, None otherwise
     """
     try:
-        client = get_supabase_client()
-
         # Query for similar jobs with the same role and location
-        logger.info(f"Searching for similar jobs with role: {role}, location: {location}")
-        response = client.table("jobs").select("*") \
-            .eq("parsed_role", role) \
-            .eq("parsed_location", location) \
-            .order("created_at", desc=True) \
-            .limit(1) \
-            .execute()
+        logger.info("Searching for similar jobs with role: %s, location: %s", role, location)
+        response = _execute(
+            _table("jobs").select(_SIMILAR_JOB_COLUMNS)
+            .eq("parsed_role", role)
+            .eq("parsed_location", location)
+            .order("created_at", desc=True)
+            .limit(1)
+        )
 
         # Extract the job from the response
         if response.data and len(response.data) > 0:
             job = response.data[0]
-            logger.info(f"Found similar job with ID: {job.get('id')}")
+            logger.info("Found similar job with ID: %s", job.get('id'))
             return job
         else:
-            logger.info(f"No similar job found for role: {role}, location: {location}")
+            logger.info("No similar job found for role: %s, location: %s", role, location)
             return None
 
     except Exception as e:
-        import traceback
-        tb = traceback.format_exc()
-        logger.error(f"Error getting similar job: {str(e)}\nTraceback:\n{tb}")
+        logger.exception("Error getting similar job: %s", e)
         return None
 
 def check_lead_exists(company_name: Optional[str] = None, company_url: Optional[str] = None) -> bool:
@@ -208,8 +372,7 @@ def check_lead_exists(company_name: Optional[str] = None, company_url: Optional[
         True if a lead exists, False otherwise
     """
     try:
-        client = get_supabase_client()
-        query = client.table("leads").select("id")
+        query = _table("leads").select("id")
 
         # Add filters based on provided parameters
         if company_name:
@@ -221,64 +384,106 @@ def check_lead_exists(company_name: Optional[str] = None, company_url: Optional[
             return False
 
         # Execute the query
-        response = query.execute()
+        response = _execute(query)
 
         # Check if any leads were found
         exists = response.data and len(response.data) > 0
         if exists:
-            logger.info(f"Lead already exists for company: {company_name or company_url}")
+            logger.info("Lead already exists for company: %s", company_name or company_url)
         else:
-            logger.info(f"No existing lead found for company: {company_name or company_url}")
+            logger.info("No existing lead found for company: %s", company_name or company_url)
 
         return exists
 
     except Exception as e:
-        import traceback
-        tb = traceback.format_exc()
-        logger.error(f"Error checking if lead exists: {str(e)}\nTraceback:\n{tb}")
+        logger.exception("Error checking if lead exists: %s", e)
         return False
 
 def save_lead(lead: Lead, job_id: str) -> Optional[str]:
     """
     Save a lead to the database
 
+    The lead is handed to a background batcher, so concurrent callers (e.g. scraper
+    workers) share one multi-row save_leads write. Blocks until that write is done.
+
     Args:
         lead: Lead object with details
         job_id: ID of the parent job
 
     Returns:
-        ID of the created lead record, or None if failed
+        ID of the created lead record, or None if failed or a duplicate
     """
     try:
-        # Check if lead already exists
-        if lead.company_name or lead.company_url:
-            if check_lead_exists(lead.company_name, lead.company_url):
-                logger.info(f"Skipping duplicate lead for company: {lead.company_name}")
-                return None
-
-        client = get_supabase_client()
+        return _lead_batcher.submit((lead, job_id)).result()
+    except Exception as e:
+        logger.error("Error saving lead: %s", e)
+        return None
 
-        # Convert Lead object to dict for insertion
-        lead_data = lead.dict(exclude={"id"})
-        # Add job_id
-        lead_data["job_id"] = job_id
+def save_leads(leads: List[Lead], job_id: str) -> List[Optional[str]]:
+    """
+    Save several leads to the database with a single multi-row write
 
-        # Insert the lead record
-        logger.info(f"Saving lead for job {job_id}: {lead.company_name}")
-        response = client.table("leads").insert(lead_data).execute()
+    Leads with a company URL are deduplicated by the database: rows are upserted
+    on company_url and silently skipped if one already exists. Leads without a URL
+    fall back to a lookup by company name (one query for the whole batch).
+    Duplicates within the batch are dropped too.
 
-        # Extract the lead ID from the response
-        if response.data and len(response.data) > 0:
-            lead_id = response.data[0].get("id")
-            logger.info(f"Lead saved with ID: {lead_id}")
-            return lead_id
-        else:
-            logger.error("Failed to get lead ID from Supabase response")
-            return None
+    Args:
+        leads: Lead objects to save
+        job_id: ID of the parent job
 
+    Returns:
+        List aligned with leads holding each new lead ID, or None for skipped or failed leads
+    """
+    try:
+        return _save_leads(leads, job_id)
     except Exception as e:
-        logger.error(f"Error saving lead: {str(e)}")
-        return None
+        logger.exception("Error saving leads: %s", e)
+        return [None] * len(leads)
+
+def _save_leads(leads: List[Lead], job_id: str) -> List[Optional[str]]:
+    """
+    save_leads without the error handling, so the batcher can tell a failed write from skipped leads
+
+    Raises:
+        Exception: If a database call fails
+    """
+    if not leads:
+        return []
+
+    # Without a URL the database can't dedupe, so check those leads by name first
+    names = url_less_company_names(leads)
+    existing_names = set()
+    if names:
+        response = _execute(_table("leads").select("company_name").in_("company_name", names))
+        existing_names = {row["company_name"] for row in response.data or []}
+
+    rows, positions = build_lead_rows(leads, job_id, existing_names)
+    if not rows:
+        return [None] * len(leads)
+
+    # Insert all new leads in a single request; rows whose company_url already
+    # exists are ignored and left out of the response. Rows without a URL are plain
+    # inserts (a repeat would conflict on job_id, job_url), so this isn't idempotent
+    logger.info("Saving %s leads for job %s", len(rows), job_id)
+    response = _execute(
+        _table("leads")
+        .upsert(rows, on_conflict="company_url", ignore_duplicates=True),
+        idempotent=False,
+    )
+
+    lead_ids = map_lead_ids(response.data or [], positions, len(leads))
+    saved = sum(1 for lead_id in lead_ids if lead_id)
+    if saved < len(rows):
+        logger.info("Skipped %s leads whose company already exists", len(rows) - saved)
+    logger.info("Saved %s of %s leads", saved, len(leads))
+    return lead_ids
+
+def _write_leads(items: List[Tuple[Lead, str]]) -> List[Optional[str]]:
+    """Batcher writer for save_lead: the batcher groups items by job, so all share one job_id"""
+    return _save_leads([lead for lead, _ in items], items[0][1])
+
+_lead_batcher = _Batcher("leads", _write_leads, key=lambda item: item[1])
 
 def update_lead_status(lead_id: str, status: str, email: Optional[str] = None, error_message: Optional[str] = None) -> bool:
     """
@@ -293,27 +498,96 @@ def update_lead_status(lead_id: str, status: str, email: Optional[str] = None, e
     Returns:
         True if update succeeded, False otherwise
     """
-    try:
-        client = get_supabase_client()
+    logger.info("Updating lead %s status to: %s", lead_id, status)
+    return _update("leads", lead_id, status_update(status, contact_email=email, error_message=error_message))
+
+def update_lead_status_async(lead_id: str, status: str, email: Optional[str] = None, error_message: Optional[str] = None) -> Future:
+    """
+    Update the status of a lead on the background writer without waiting for it
+
+    Writes submitted this way may land out of order relative to each other.
 
-        # Prepare update data
-        update_data = {"status": status}
-        if email:
-            update_data["contact_email"] = email
-        if error_message:
-            update_data["error_message"] = error_message
+    Args:
+        lead_id: ID of the lead to update
+        status: New status value
+        email: Optional email address found
+        error_message: Optional error message
+
+    Returns:
+        Future resolved with update_lead_status's result
+    """
+    return _writer.submit(update_lead_status, lead_id, status, email, error_message)
 
-        # Update the lead record
-        logger.info(f"Updating lead {lead_id} status to: {status}")
-        response = client.table("leads").update(update_data).eq("id", lead_id).execute()
+def flush_lead_status_updates(pending: List[Dict[str, Any]]) -> bool:
+    """
+    Apply a batch of deferred lead status updates
+
+    Updates with identical values (e.g. every lead moving to "EmailSent") are sent
+    as one UPDATE ... WHERE id IN (...) request, so N updates usually cost only a
+    handful of round trips. If a grouped update fails, its leads are retried one
+    at a time through update_lead_status.
+
+    Args:
+        pending: List of dicts with id and status, plus optional contact_email and error_message
 
+    Returns:
+        True if every update succeeded, False otherwise
+    """
+    if not pending:
         return True
 
-    except Exception as e:
-        import traceback
-        tb = traceback.format_exc()
-        logger.error(f"Error updating lead status: {str(e)}\nTraceback:\n{tb}")
-        return False
+    # Group lead IDs by the exact set of values to write
+    groups: Dict[tuple, List[str]] = {}
+    for update in pending:
+        update_data = status_update(
+            update["status"],
+            contact_email=update.get("contact_email"),
+            error_message=update.get("error_message"),
+        )
+        groups.setdefault(tuple(sorted(update_data.items())), []).append(update["id"])
+
+    ok = True
+
+    logger.info("Flushing %s lead status updates in %s requests", len(pending), len(groups))
+    for values, lead_ids in groups.items():
+        update_data = dict(values)
+        try:
+            _execute(_table("leads").update(update_data, returning=ReturnMethod.minimal).in_("id", lead_ids))
+        except Exception as e:
+            logger.warning("Grouped lead status update failed, retrying per lead: %s", e)
+            for lead_id in lead_ids:
+                ok = update_lead_status(
+                    lead_id,
+                    update_data["status"],
+                    email=update_data.get("contact_email"),
+                    error_message=update_data.get("error_message"),
+                ) and ok
+
+    return ok
+
+def _write_email_logs(rows: List[Dict[str, Any]]) -> List[str]:
+    """Batcher writer for email logs: insert all rows in one request"""
+    # IDs are generated client-side, so nothing needs to come back, and upserting on
+    # the primary key means a retried insert that already landed is ignored
+    _execute(
+        _table("emails")
+        .upsert(rows, ignore_duplicates=True, returning=ReturnMethod.minimal)
+    )
+    logger.info("Inserted %s email log records", len(rows))
+    return [row["id"] for row in rows]
+
+_email_log_batcher = _Batcher("emails", _write_email_logs)
+
+def flush_email_logs() -> None:
+    """Block until every queued email log row has been written (or failed), e.g. before shutdown"""
+    _email_log_batcher.flush()
+
+def flush_pending_writes() -> None:
+    """Block until every batched lead and email log write has finished"""
+    _lead_batcher.flush()
+    _email_log_batcher.flush()
+
+atexit.register(flush_pending_writes)
 
 def log_email_sent(lead_id: str, to_email: str, subject: str, template_name: str,
                 tracking_id: Optional[str] = None, status: str = "Sent",
@@ -321,6 +595,8 @@ def log_email_sent(lead_id: str, to_email: str, subject: str, template_name: str
     """
     Log an email that was sent
 
+    Thin wrapper around log_emails_sent for a single email.
+
     Args:
         lead_id: ID of the lead the email was sent to
         to_email: Recipient email address
@@ -334,45 +610,58 @@ def log_email_sent(lead_id: str, to_email: str, subject: str, template_name: str
     Returns:
         ID of the created email log record, or None if failed
     """
-    try:
-        client = get_supabase_client()
-
-        # Prepare email log data
-        email_data = {
-            "lead_id": lead_id,
-            "to_email": to_email,
-            "subject": subject,
-            "template_used": template_name,
-            "status": status,
-        }
-
-        if tracking_id:
-            email_data["email_tracking_id"] = tracking_id
+    return log_emails_sent([{
+        "lead_id": lead_id,
+        "to_email": to_email,
+        "subject": subject,
+        "template_name": template_name,
+        "tracking_id": tracking_id,
+        "status": status,
+        "body": body,
+        "scheduled_at": scheduled_at,
+    }])[0]
+
+def log_emails_sent(emails: List[Dict[str, Any]]) -> List[Optional[str]]:
+    """
+    Log several sent emails at once
 
-        if body:
-            email_data["body"] = body
+    Rows are handed to a background batcher, so concurrent callers share one
+    multi-row insert. Blocks until the rows have been written.
 
-        if scheduled_at:
-            email_data["scheduled_at"] = scheduled_at
+    Args:
+        emails: Dicts with the log_email_sent arguments (lead_id, to_email, subject,
+            template_name, and optionally tracking_id, status, body, scheduled_at)
 
-        # Insert the email log record
-        logger.info(f"Logging email sent to: {to_email}")
-        response = client.table("emails").insert(email_data).execute()
+    Returns:
+        List aligned with emails holding each created record's ID, or None if failed
+    """
+    email_ids: List[Optional[str]] = [None] * len(emails)
+    futures: List[Tuple[int, Future]] = []
 
-        # Extract the email log ID from the response
-        if response.data and len(response.data) > 0:
-            email_id = response.data[0].get("id")
-            logger.info(f"Email log created with ID: {email_id}")
-            return email_id
-        else:
-            logger.error("Failed to get email log ID from Supabase response")
-            return None
+    try:
+        for index, email in enumerate(emails):
+            # Prepare email log data; the ID is generated client-side so batched rows need no response
+            email_data = email_log_row(
+                email["lead_id"], email["to_email"], email["subject"], email["template_name"],
+                tracking_id=email.get("tracking_id"), status=email.get("status"),
+                body=email.get("body"), scheduled_at=email.get("scheduled_at"),
+            )
+
+            # Queue the email log record for the background writer
+            logger.info("Logging email sent to: %s", email['to_email'])
+            futures.append((index, _email_log_batcher.submit(email_data)))
 
     except Exception as e:
-        import traceback
-        tb = traceback.format_exc()
-        logger.error(f"Error logging email: {str(e)}\nTraceback:\n{tb}")
-        return None
+        logger.exception("Error logging email: %s", e)
+
+    # Only report an ID once its row has actually been written
+    for index, future in futures:
+        try:
+            email_ids[index] = future.result()
+        except Exception as e:
+            logger.error("Error logging email: %s", e)
+
+    return email_ids
 
 def get_leads_to_email(job_id: str) -> List[Dict[str, Any]]:
     """
@@ -382,58 +671,56 @@ def get_leads_to_email(job_id: str) -> List[Dict[str, Any]]:
         job_id: ID of the job
 
     Returns:
-        List of lead records that have contact emails but haven't been emailed yet
+        List of lead records (the Lead model fields plus id and job_id) that have contact emails but haven't been emailed yet
     """
     try:
-        client = get_supabase_client()
-
-        # Query for leads with emails that haven't been emailed yet
-        logger.info(f"Fetching leads ready for emailing for job: {job_id}")
-        response = client.table("leads").select("*") \
-            .eq("job_id", job_id) \
-            .not_.is_("contact_email", "null") \
-            .eq("status", "ReadyToSend") \
-            .execute()
+        # The leads_ready_to_email database function applies the filters server-side,
+        # off the partial index leads_ready_idx, and returns only the columns needed
+        logger.info("Fetching leads ready for emailing for job: %s", job_id)
+        response = _execute(get_supabase_client().rpc("leads_ready_to_email", {"p_job_id": job_id}))
 
         if response.data:
-            logger.info(f"Found {len(response.data)} leads ready for emailing")
+            logger.info("Found %s leads ready for emailing", len(response.data))
             return response.data
         else:
             logger.info("No leads ready for emailing found")
             return []
 
     except Exception as e:
-        logger.error(f"Error getting leads to email: {str(e)}")
+        logger.error("Error getting leads to email: %s", e)
         return []
 
 def get_templates() -> List[Dict[str, Any]]:
     """
-    Get all email templates
+    Get all email templates, cached for a few minutes
 
     Returns:
         List of email template records
     """
-    try:
-        client = get_supabase_client()
+    cached = get_cached_template(("list",))
+    if cached is not None:
+        return cached
 
+    try:
         # Query for all templates
         logger.info("Fetching email templates")
-        response = client.table("templates").select("*").execute()
+        response = _execute(_table("templates").select(TEMPLATE_COLUMNS))
 
         if response.data:
-            logger.info(f"Found {len(response.data)} email templates")
+            logger.info("Found %s email templates", len(response.data))
+            set_cached_template(("list",), response.data)
             return response.data
         else:
             logger.info("No email templates found")
             return []
 
     except Exception as e:
-        logger.error(f"Error getting email templates: {str(e)}")
+        logger.error("Error getting email templates: %s", e)
         return []
 
 def get_template_by_name(name: str) -> Optional[Dict[str, Any]]:
     """
-    Get an email template by name
+    Get an email template by name, cached for a few minutes
 
     Args:
         name: Name of the template
@@ -441,45 +728,40 @@ def get_template_by_name(name: str) -> Optional[Dict[str, Any]]:
     Returns:
         Template record if found, None otherwise
     """
-    try:
-        client = get_supabase_client()
-
-        # Query for the template
-        logger.info(f"Fetching email template: {name}")
-        response = client.table("templates").select("*").eq("name", name).execute()
+    cached = get_cached_template(("name", name))
+    if cached is not None:
+        return cached
 
-        if response.data and len(response.data) > 0:
-            logger.info(f"Found template: {name}")
-            return response.data[0]
+    try:
+        # Query for the template; name is unique, so ask for a single object rather than an array
+        logger.info("Fetching email template: %s", name)
+        response = _execute(_table("templates").select(TEMPLATE_COLUMNS).eq("name", name).maybe_single())
+
+        # Depending on the client version, no match is either a None response or None data
+        if response is not None and response.data:
+            logger.info("Found template: %s", name)
+            # Only hits are cached, so a template created later is picked up right away
+            set_cached_template(("name", name), response.data)
+            return response.data
         else:
-            logger.warning(f"Template not found: {name}")
+            logger.warning("Template not found: %s", name)
             return None
 
     except Exception as e:
-        import traceback
-        error_trace = traceback.format_exc()
-        logger.error(f"Error getting email template: {str(e)}\nTraceback:\n{error_trace}")
+        logger.exception("Error getting email template: %s", e)
         return None
 
 
 # Create default email template if none exist
 def ensure_default_template() -> str:
     """
-    Ensure at least one default email template exists
+    Ensure the default email template exists
 
     Returns:
         Name of the default template
     """
     try:
-        client = get_supabase_client()
-
-        # Check if any templates exist
-        templates = get_templates()
-        if templates:
-            logger.info(f"Found existing templates: {[t['name'] for t in templates]}")
-            return templates[0]["name"]
-
-        # Create a default template
+        # Create the default template
         default_template = {
             "name": "Default Template",
             "subject": "Regarding {role} role at {company_name}",
@@ -502,15 +784,31 @@ def ensure_default_template() -> str:
             "variables": ["role", "founder_name", "company_name"]
         }
 
-        # Insert the template
-        logger.info("Creating default email template")
-        response = client.table("templates").insert(default_template).execute()
-        logger.info(f"Default template created with response: {response}")
+        # Upsert on the unique name in one round trip; an existing template is left as is,
+        # so concurrent callers can't race between a check and the insert
+        response = _execute(
+            _table("templates")
+            .upsert(default_template, on_conflict="name", ignore_duplicates=True)
+        )
+
+        # Ignored duplicates come back as an empty result
+        if response.data:
+            logger.info("Default email template created")
+            invalidate_templates()
 
         return "Default Template"
 
     except Exception as e:
-        import traceback
-        error_trace = traceback.format_exc()
-        logger.error(f"Error ensuring default template: {str(e)}\nTraceback:\n{error_trace}")
-        return "Default Template"  # Return the name anyway as a fallback
\ No newline at end of file
+        logger.exception("Error ensuring default template: %s", e)
+        return "Default Template"  # Return the name anyway as a fallback
+
+def _prewarm() -> None:
+    """Open the Supabase client's connection with a cheap query so the first real call skips the handshake"""
+    try:
+        _table("jobs").select("id").limit(1).execute()
+    except Exception as e:
+        logger.debug("Supabase prewarm failed: %s", e)
+
+def prewarm() -> None:
+    """Warm the Supabase connection pool in a background thread"""
+    threading.Thread(target=_prewarm, name="supabase-prewarm", daemon=True).start()
@@ -0,0 +1,345 @@
+"""
+Async Supabase integration tools, for pipelines that overlap database calls
+
+These mirror the blocking helpers in supabase.py on top of supabase-py's
+AsyncClient, so callers can run many of them at once, e.g.
+await asyncio.gather(*[asave_lead(lead, job_id) for lead in leads])
+
+For thousands of leads at once, asave_leads_bulk writes them in chunked
+multi-row requests instead.
+"""
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional
+from postgrest.types import ReturnMethod
+from supabase import acreate_client, AsyncClient
+from ..models import Lead
+from .supabase_common import (
+    RETRY_ATTEMPTS, TEMPLATE_COLUMNS, build_lead_rows, email_log_row, get_cached_template,
+    get_supabase_config, is_transient, map_lead_ids, retry_delay, set_cached_template,
+    status_update, url_less_company_names,
+)
+
+logger = logging.getLogger(__name__)
+
+# Shared async client and the event loop it was created on; its HTTP connections
+# belong to that loop, so a new client is built if called from another one
+_async_client: Optional[AsyncClient] = None
+_async_client_loop: Optional[asyncio.AbstractEventLoop] = None
+_async_client_lock: Optional[asyncio.Lock] = None
+
+async def aget_supabase_client() -> AsyncClient:
+    """
+    Get the shared async Supabase client for the running event loop
+
+    Returns:
+        Supabase AsyncClient instance
+
+    Raises:
+        ValueError: If Supabase URL or API key are not configured
+    """
+    global _async_client, _async_client_loop, _async_client_lock
+    loop = asyncio.get_running_loop()
+    if _async_client_loop is not loop:
+        stale_client, stale_loop = _async_client, _async_client_loop
+        _async_client, _async_client_loop, _async_client_lock = None, loop, asyncio.Lock()
+        if stale_client is not None:
+            _discard_client(stale_client, stale_loop)
+
+    if _async_client is None:
+        async with _async_client_lock:
+            if _async_client is None:
+                config = get_supabase_config()
+                _async_client = await acreate_client(config.url, config.key)
+    return _async_client
+
+async def _aclose_client(client: AsyncClient) -> None:
+    """Close the HTTP connections held by a client's PostgREST session"""
+    try:
+        await client.postgrest.aclose()
+    except Exception as e:
+        logger.warning("Error closing stale Supabase client: %s", e)
+
+def _discard_client(client: AsyncClient, loop: asyncio.AbstractEventLoop) -> None:
+    """
+    Close a client built on another event loop
+
+    Its connections can only be closed on the loop that opened them, so this is
+    scheduled there if that loop is still running; a closed loop has already
+    torn down their transports.
+    """
+    if loop.is_running():
+        asyncio.run_coroutine_threadsafe(_aclose_client(client), loop)
+    elif not loop.is_closed():
+        logger.warning("Dropping Supabase client whose event loop is stopped; its connections stay open")
+
+async def _aexecute(query: Any, idempotent: bool = True) -> Any:
+    """
+    Execute a PostgREST query builder, retrying transient failures with jittered exponential backoff
+
+    Pass idempotent=False for writes that could fail or apply twice if repeated;
+    those are only retried when the request was never sent (see is_transient).
+    """
+    for attempt in range(1, RETRY_ATTEMPTS + 1):
+        try:
+            return await query.execute()
+        except Exception as e:
+            if attempt == RETRY_ATTEMPTS or not is_transient(e, idempotent):
+                raise
+            delay = retry_delay(attempt)
+            logger.warning("Transient Supabase error (attempt %s/%s), retrying in %.2fs: %s", attempt, RETRY_ATTEMPTS, delay, e)
+            await asyncio.sleep(delay)
+
+async def aupdate_job_status(job_id: str, status: str, error_message: Optional[str] = None) -> bool:
+    """
+    Update the status of a job
+
+    Args:
+        job_id: ID of the job to update
+        status: New status value
+        error_message: Optional error message
+
+    Returns:
+        True if update succeeded, False otherwise
+    """
+    try:
+        client = await aget_supabase_client()
+
+        # Prepare update data
+        update_data = status_update(status, error_message=error_message)
+
+        # Update the job record
+        logger.info("Updating job %s status to: %s", job_id, status)
+        await _aexecute(client.table("jobs").update(update_data, returning=ReturnMethod.minimal).eq("id", job_id))
+
+        return True
+
+    except Exception as e:
+        logger.exception("Error updating job status: %s", e)
+        return False
+
+async def asave_lead(lead: Lead, job_id: str) -> Optional[str]:
+    """
+    Save a lead to the database
+
+    Deduplicates like save_leads: leads with a company URL are upserted on
+    company_url and skipped if one already exists; leads without a URL are
+    checked by company name first.
+
+    Args:
+        lead: Lead object with details
+        job_id: ID of the parent job
+
+    Returns:
+        ID of the created lead record, or None if failed or a duplicate
+    """
+    lead_ids = await asave_leads_bulk([lead], job_id)
+    if lead_ids[0]:
+        logger.info("Lead saved with ID: %s", lead_ids[0])
+    return lead_ids[0]
+
+# Rows per request for bulk writes, keeping each body well under PostgREST's size
+# limit, and how many of those requests run at once
+_BULK_CHUNK_SIZE = 500
+_BULK_CONCURRENCY = 4
+
+async def _bulk_upsert(table: str, rows: List[Dict[str, Any]], on_conflict: str,
+                       chunk_size: int = _BULK_CHUNK_SIZE) -> List[Dict[str, Any]]:
+    """
+    Upsert rows in chunks, sending up to _BULK_CONCURRENCY chunks concurrently
+
+    Rows that conflict on on_conflict are skipped and left out of the result. A
+    failed chunk is logged and contributes no rows, without affecting the others.
+
+    Returns:
+        The inserted rows from every successful chunk
+    """
+    client = await aget_supabase_client()
+    semaphore = asyncio.Semaphore(_BULK_CONCURRENCY)
+
+    async def upsert_chunk(chunk: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        async with semaphore:
+            try:
+                # Rows without a value for on_conflict are plain inserts, so a repeat isn't safe
+                response = await _aexecute(
+                    client.table(table).upsert(chunk, on_conflict=on_conflict, ignore_duplicates=True),
+                    idempotent=False,
+                )
+                return response.data or []
+            except Exception as e:
+                logger.exception("Error writing chunk of %s %s rows: %s", len(chunk), table, e)
+                return []
+
+    results = await asyncio.gather(*[
+        upsert_chunk(rows[i:i + chunk_size]) for i in range(0, len(rows), chunk_size)
+    ])
+    return [record for records in results for record in records]
+
+async def asave_leads_bulk(leads: List[Lead], job_id: str) -> List[Optional[str]]:
+    """
+    Save a large number of leads in chunked, concurrent multi-row writes
+
+    Deduplicates like save_leads: leads with a company URL are upserted on
+    company_url and skipped if one already exists; leads without a URL are
+    checked by company name first. Duplicates within the list are dropped too.
+
+    Args:
+        leads: Lead objects to save
+        job_id: ID of the parent job
+
+    Returns:
+        List aligned with leads holding each new lead ID, or None for skipped or failed leads
+    """
+    lead_ids: List[Optional[str]] = [None] * len(leads)
+    if not leads:
+        return lead_ids
+
+    try:
+        client = await aget_supabase_client()
+
+        # Without a URL the database can't dedupe, so check those leads by name first
+        names = url_less_company_names(leads)
+        existing_names = set()
+        for i in range(0, len(names), _BULK_CHUNK_SIZE):
+            response = await _aexecute(
+                client.table("leads").select("company_name").in_("company_name", names[i:i + _BULK_CHUNK_SIZE])
+            )
+            existing_names.update(row["company_name"] for row in response.data or [])
+
+        rows, positions = build_lead_rows(leads, job_id, existing_names)
+        if not rows:
+            return lead_ids
+
+        logger.info("Saving %s leads for job %s in chunks of %s", len(rows), job_id, _BULK_CHUNK_SIZE)
+        records = await _bulk_upsert("leads", rows, on_conflict="company_url")
+
+        lead_ids = map_lead_ids(records, positions, len(leads))
+
+        logger.info("Saved %s of %s leads", sum(1 for lead_id in lead_ids if lead_id), len(leads))
+        return lead_ids
+
+    except Exception as e:
+        logger.exception("Error saving leads: %s", e)
+        return lead_ids
+
+async def aupdate_lead_status(lead_id: str, status: str, email: Optional[str] = None, error_message: Optional[str] = None) -> bool:
+    """
+    Update the status of a lead
+
+    Args:
+        lead_id: ID of the lead to update
+        status: New status value
+        email: Optional email address found
+        error_message: Optional error message
+
+    Returns:
+        True if update succeeded, False otherwise
+    """
+    try:
+        client = await aget_supabase_client()
+
+        # Prepare update data
+        update_data = status_update(status, contact_email=email, error_message=error_message)
+
+        # Update the lead record
+        logger.info("Updating lead %s status to: %s", lead_id, status)
+        await _aexecute(client.table("leads").update(update_data, returning=ReturnMethod.minimal).eq("id", lead_id))
+
+        return True
+
+    except Exception as e:
+        logger.exception("Error updating lead status: %s", e)
+        return False
+
+async def alog_email_sent(lead_id: str, to_email: str, subject: str, template_name: str,
+                          tracking_id: Optional[str] = None, status: str = "Sent",
+                          body: Optional[str] = None, scheduled_at: Optional[str] = None) -> Optional[str]:
+    """
+    Log an email that was sent
+
+    Args:
+        lead_id: ID of the lead the email was sent to
+        to_email: Recipient email address
+        subject: Email subject
+        template_name: Name of the template used
+        tracking_id: Optional tracking ID for the email
+        status: Email status (default: "Sent")
+        body: Optional email body text
+        scheduled_at: Optional scheduled send time
+
+    Returns:
+        ID of the created email log record, or None if failed
+    """
+    try:
+        client = await aget_supabase_client()
+
+        # Prepare email log data; same row shape as the blocking log_email_sent
+        email_data = email_log_row(lead_id, to_email, subject, template_name, tracking_id=tracking_id,
+                                   status=status, body=body, scheduled_at=scheduled_at)
+
+        # Upsert on the client-generated primary key, so a retry of a row that already landed is ignored
+        logger.info("Logging email sent to: %s", to_email)
+        await _aexecute(
+            client.table("emails").upsert(email_data, ignore_duplicates=True, returning=ReturnMethod.minimal)
+        )
+        return email_data["id"]
+
+    except Exception as e:
+        logger.exception("Error logging email: %s", e)
+        return None
+
+async def aget_leads_to_email(job_id: str) -> List[Dict[str, Any]]:
+    """
+    Get leads that are ready to be emailed for a job
+
+    Args:
+        job_id: ID of the job
+
+    Returns:
+        List of lead records (the Lead model fields plus id and job_id) that have contact emails but haven't been emailed yet
+    """
+    try:
+        client = await aget_supabase_client()
+
+        # Filtered server-side by the leads_ready_to_email function, like get_leads_to_email
+        logger.info("Fetching leads ready for emailing for job: %s", job_id)
+        response = await _aexecute(client.rpc("leads_ready_to_email", {"p_job_id": job_id}))
+
+        return response.data or []
+
+    except Exception as e:
+        logger.error("Error getting leads to email: %s", e)
+        return []
+
+async def aget_template_by_name(name: str) -> Optional[Dict[str, Any]]:
+    """
+    Get an email template by name, sharing the template cache of get_template_by_name
+
+    Args:
+        name: Name of the template
+
+    Returns:
+        Template record if found, None otherwise
+    """
+    cached = get_cached_template(("name", name))
+    if cached is not None:
+        return cached
+
+    try:
+        client = await aget_supabase_client()
+
+        # Query for the template; name is unique, so ask for a single object rather than an array
+        logger.info("Fetching email template: %s", name)
+        response = await _aexecute(client.table("templates").select(TEMPLATE_COLUMNS).eq("name", name).maybe_single())
+
+        # Depending on the client version, no match is either a None response or None data
+        if response is not None and response.data:
+            set_cached_template(("name", name), response.data)
+            return response.data
+
+        logger.warning("Template not found: %s", name)
+        return None
+
+    except Exception as e:
+        logger.exception("Error getting email template: %s", e)
+        return None
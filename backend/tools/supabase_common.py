@@ -0,0 +1,204 @@
+"""
+Helpers shared by the blocking (supabase.py) and async (supabase_async.py) Supabase tools
+"""
+import copy
+import os
+import logging
+import random
+import threading
+import uuid
+import httpx
+from cachetools import TTLCache
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+from postgrest.exceptions import APIError
+from ..models import Lead
+
+logger = logging.getLogger(__name__)
+
+# Columns returned for templates: what rendering an email needs
+TEMPLATE_COLUMNS = "id, name, subject, body, variables"
+
+# Lead model fields that aren't columns of the leads table
+LEAD_EXCLUDE = frozenset({"id"})
+
+class SupabaseConfig(NamedTuple):
+    """Supabase project URL and API key"""
+    url: str
+    key: str
+
+# Read from the environment on first use rather than at import, since the API loads .env after importing tools
+_config: Optional[SupabaseConfig] = None
+
+def get_supabase_config() -> SupabaseConfig:
+    """
+    Get the Supabase URL and API key, reading the environment only once
+
+    Raises:
+        ValueError: If Supabase URL or API key are not configured
+    """
+    global _config
+    if _config is None:
+        supabase_url = os.environ.get("SUPABASE_URL")
+        supabase_key = os.environ.get("SUPABASE_ANON_KEY")
+
+        if not supabase_url or not supabase_key:
+            error_msg = "Supabase URL and key must be provided as environment variables"
+            logger.error(error_msg)
+            raise ValueError(error_msg)
+
+        _config = SupabaseConfig(supabase_url, supabase_key)
+    return _config
+
+def reset_supabase_config() -> None:
+    """Forget the cached config so the next get_supabase_config() reads the environment again"""
+    global _config
+    _config = None
+
+def status_update(status: str, **fields: Optional[str]) -> Dict[str, Any]:
+    """Build an update payload: the status plus whichever optional fields are set"""
+    return {"status": status, **{column: value for column, value in fields.items() if value}}
+
+def email_log_row(lead_id: str, to_email: str, subject: str, template_name: str,
+                  tracking_id: Optional[str] = None, status: Optional[str] = "Sent",
+                  body: Optional[str] = None, scheduled_at: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Build an emails row with a new client-generated ID
+
+    The ID lets writes upsert on the primary key, so a retry of a row that already
+    landed is ignored. Optional fields are always present (None when unset), since
+    every row of a multi-row write must have the same keys.
+    """
+    return {
+        "id": str(uuid.uuid4()),
+        "lead_id": lead_id,
+        "to_email": to_email,
+        "subject": subject,
+        "template_used": template_name,
+        "status": status or "Sent",
+        "email_tracking_id": tracking_id or None,
+        "body": body or None,
+        "scheduled_at": scheduled_at or None,
+    }
+
+# Attempts for idempotent database calls, and the backoff between them (seconds)
+RETRY_ATTEMPTS = 3
+_RETRY_BASE_DELAY = 0.2
+_RETRY_MAX_DELAY = 2.0
+# Gateway statuses and Postgres error classes (connection lost, server shutting
+# down, serialization failure, deadlock) that are worth another attempt
+_RETRYABLE_STATUSES = frozenset({502, 503, 504})
+_RETRYABLE_PG_CODES = ("08", "57P", "40001", "40P01")
+# Failures raised before the request reached the server, so retrying can't apply a write twice
+_UNSENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+def is_transient(error: Exception, idempotent: bool = True) -> bool:
+    """
+    Whether a failed database call may succeed if simply tried again
+
+    Calls that aren't idempotent are only retried when the request never got sent.
+    """
+    if not idempotent:
+        return isinstance(error, _UNSENT_ERRORS)
+    if isinstance(error, httpx.TransportError):
+        return True
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code in _RETRYABLE_STATUSES
+    if isinstance(error, APIError):
+        return str(error.code or "").startswith(_RETRYABLE_PG_CODES)
+    return False
+
+def retry_delay(attempt: int) -> float:
+    """Seconds to wait after the given failed attempt: exponential backoff with jitter"""
+    return min(_RETRY_MAX_DELAY, _RETRY_BASE_DELAY * 2 ** (attempt - 1)) * random.uniform(0.5, 1.5)
+
+# Templates rarely change, so lookups are served from memory for a few minutes.
+# Keys are ("list",) for get_templates and ("name", name) for get_template_by_name
+_TEMPLATE_CACHE_TTL = 300
+_template_cache: TTLCache = TTLCache(maxsize=64, ttl=_TEMPLATE_CACHE_TTL)
+# TTLCache isn't thread-safe, and templates are read from worker threads
+_template_cache_lock = threading.Lock()
+
+def get_cached_template(key: Tuple[str, ...]) -> Any:
+    """Return a copy of the cached template value for key, or None"""
+    with _template_cache_lock:
+        value = _template_cache.get(key)
+    # Callers may modify what they get back, so never hand out the cached object
+    return copy.deepcopy(value)
+
+def set_cached_template(key: Tuple[str, ...], value: Any) -> None:
+    """Cache a copy of a template lookup result under key"""
+    value = copy.deepcopy(value)
+    with _template_cache_lock:
+        _template_cache[key] = value
+
+def invalidate_templates() -> None:
+    """Drop cached templates so the next lookup reads them from the database"""
+    with _template_cache_lock:
+        _template_cache.clear()
+
+def url_less_company_names(leads: Iterable[Lead]) -> List[str]:
+    """Company names of the leads without a URL, which the database can't dedupe and must be looked up"""
+    return list({lead.company_name for lead in leads if not lead.company_url and lead.company_name})
+
+def build_lead_rows(leads: List[Lead], job_id: str,
+                    existing_names: Set[str]) -> Tuple[List[Dict[str, Any]], Dict[str, int]]:
+    """
+    Turn leads into rows for a multi-row upsert on company_url, dropping duplicates
+
+    Leads with a company URL are deduplicated within the list (the database skips
+    URLs that already exist); leads without one are skipped when their company
+    name is in existing_names or earlier in the list.
+
+    Args:
+        leads: Lead objects to save
+        job_id: ID of the parent job
+        existing_names: Names from url_less_company_names that already have a lead;
+            extended with the names of the rows built
+
+    Returns:
+        Tuple of (rows to write, map of job URL to the lead's index in leads)
+    """
+    seen_urls = set()
+    rows, positions = [], {}
+    for index, lead in enumerate(leads):
+        if lead.company_url:
+            seen, key = seen_urls, str(lead.company_url)
+        elif lead.company_name:
+            seen, key = existing_names, lead.company_name
+        else:
+            seen, key = None, None
+
+        if seen is not None:
+            if key in seen:
+                logger.info("Skipping duplicate lead for company: %s", lead.company_name or key)
+                continue
+            seen.add(key)
+
+        # None fields are kept so every row in a multi-row upsert has the same keys
+        lead_data = lead.model_dump(mode="json", exclude=LEAD_EXCLUDE)
+        lead_data["job_id"] = job_id
+        rows.append(lead_data)
+        positions[str(lead.job_url)] = index
+
+    return rows, positions
+
+def map_lead_ids(records: Iterable[Dict[str, Any]], positions: Dict[str, int], count: int) -> List[Optional[str]]:
+    """
+    Line the IDs of upserted lead rows up with the leads they came from
+
+    job_url is unique per job, so it maps returned rows back to their leads.
+
+    Args:
+        records: Rows returned by the upsert (skipped duplicates are absent)
+        positions: Job URL to lead index map from build_lead_rows
+        count: Number of leads passed to build_lead_rows
+
+    Returns:
+        List aligned with the leads holding each new lead ID, or None for skipped leads
+    """
+    lead_ids: List[Optional[str]] = [None] * count
+    for record in records:
+        index = positions.get(record.get("job_url"))
+        if index is not None:
+            lead_ids[index] = record.get("id")
+    return lead_ids